@@ -2,20 +2,83 @@
 # 🔐 auth/admin.py — JWT-Based Admin Verification
 # ─────────────────────────────────────────────
 
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from fastapi import Request, HTTPException, status
 from jose import jwt, JWTError
 from logger import logger
 
 SECRET_KEY = os.getenv("SECRET_KEY") or "supersecret"
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
 
-def admin_required(request: Request):
+# ─────────────────────────────────────────────
+# 🧠 Verified-token cache — token digest → (subject, exp)
+# ─────────────────────────────────────────────
+_token_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_subject(key: str) -> str | None:
+    """Return the cached subject of a still-valid token (by digest), or None."""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            _token_cache_stats["misses"] += 1
+            return None
+        subject, exp = entry
+        if exp <= time.time():
+            del _token_cache[key]
+            _token_cache_stats["evictions"] += 1
+            _token_cache_stats["misses"] += 1
+            return None
+        _token_cache.move_to_end(key)
+        _token_cache_stats["hits"] += 1
+        return subject
+
+
+def _remember_token(key: str, subject: str, exp) -> None:
+    """Cache a verified token (by digest) until its `exp` claim (LRU-bounded)."""
+    if not exp:
+        return
+    with _token_cache_lock:
+        _token_cache[key] = (subject, float(exp))
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+            _token_cache_stats["evictions"] += 1
+
+
+def forget_token(token: str | None) -> None:
+    """Drop a token from the verified-token cache (e.g. on logout)."""
+    if not token:
+        return
+    with _token_cache_lock:
+        _token_cache.pop(_token_digest(token), None)
+
+
+def get_token_cache_stats() -> dict:
+    """Snapshot of the token cache counters and its current size."""
+    with _token_cache_lock:
+        return {**_token_cache_stats, "size": len(_token_cache)}
+
+
+async def admin_required(request: Request):
     """
     Dependency for protected admin routes.
 
     Verifies the presence of a valid JWT token in the HttpOnly cookie
-    and ensures the token belongs to the authorized admin.
+    and ensures the token belongs to the authorized admin. Tokens that
+    passed verification are cached until their `exp`, so repeat requests
+    skip the decode and HMAC check.
 
     Raises:
         401 Unauthorized — if token is missing or invalid
@@ -30,6 +93,11 @@ def admin_required(request: Request):
         logger.warning("🚫 Missing access token cookie.")
         raise HTTPException(status_code=401, detail="Missing authentication token")
 
+    key = _token_digest(token)  # hashed once, for both the lookup and the insert
+    email = _cached_subject(key)
+    if email is not None:
+        return email
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
         email = payload.get("sub")
@@ -38,6 +106,7 @@ def admin_required(request: Request):
             logger.warning(f"⚠️ Access denied — token email '{email}' is not authorized.")
             raise HTTPException(status_code=403, detail="Access denied: not an authorized admin")
 
+        _remember_token(key, email, payload.get("exp"))
         logger.info(f"🔐 Admin token verified for {email}")
         return email
 
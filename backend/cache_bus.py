@@ -0,0 +1,127 @@
+# ─────────────────────────────────────────────
+# 🔄 cache_bus.py — Cross-Worker Cache Invalidation
+# ─────────────────────────────────────────────
+#
+# Each uvicorn worker keeps its own in-process caches (e.g. the service
+# catalog). A write only invalidates the cache of the worker that made it,
+# so writes also bump a per-namespace version in `cache_generation`, inside
+# their own transaction. Every worker polls that tiny table every
+# CACHE_SYNC_INTERVAL_MS and calls the invalidation callbacks of the
+# namespaces whose version moved: a stale entry survives at most one
+# interval, with no broker to run.
+
+import asyncio
+import os
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import CacheGeneration
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+CACHE_SYNC_INTERVAL_MS = int(os.getenv("CACHE_SYNC_INTERVAL_MS", 1000))
+
+_BUMP_SQL = text(
+    "INSERT INTO cache_generation (namespace, version) VALUES (:namespace, 1) "
+    "ON CONFLICT (namespace) DO UPDATE SET version = cache_generation.version + 1"
+)
+
+_VERSIONS_QUERY = select(CacheGeneration.namespace, CacheGeneration.version)
+
+
+class CacheBus:
+    """Polls `cache_generation` and fans version changes out to local caches."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._subscribers: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self.stats = {"polls": 0, "poll_errors": 0, "invalidations": 0}
+
+    def subscribe(self, namespace: str, callback: Callable[[], None]) -> None:
+        """Call `callback` whenever another worker writes to `namespace`."""
+        self._subscribers[namespace].append(callback)
+
+    def bump(self, session: Session, namespace: str) -> None:
+        """Record a write to `namespace`, in the caller's transaction."""
+        session.execute(_BUMP_SQL, {"namespace": namespace})
+
+    async def bump_async(self, session: AsyncSession, namespace: str) -> None:
+        """Async version of `bump`."""
+        await session.execute(_BUMP_SQL, {"namespace": namespace})
+
+    def _invalidate(self, namespaces) -> None:
+        for namespace in namespaces:
+            for callback in self._subscribers.get(namespace, ()):
+                callback()
+            self.stats["invalidations"] += 1
+
+    def apply(self, versions: dict[str, int]) -> list[str]:
+        """
+        Invalidate every subscribed namespace whose version differs from the
+        last one seen. The first poll invalidates whatever was filled before it.
+
+        Returns:
+            list[str]: The namespaces that changed.
+        """
+        with self._lock:
+            changed = [ns for ns in self._subscribers if versions.get(ns) != self._seen.get(ns)]
+            self._seen = versions
+        self._invalidate(changed)
+        if changed:
+            logger.debug(f"🔄 Cache namespaces changed elsewhere: {', '.join(changed)}")
+        return changed
+
+    async def poll(self, engine: AsyncEngine) -> list[str]:
+        """Read the current versions once and apply them."""
+        async with engine.connect() as conn:
+            versions = dict((await conn.execute(_VERSIONS_QUERY)).all())
+        self.stats["polls"] += 1
+        return self.apply(versions)
+
+    async def _run(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.poll(engine)
+            except Exception as e:
+                # Versions unknown: drop everything rather than serve stale data
+                self.stats["poll_errors"] += 1
+                logger.warning(f"⚠️ Cache version poll failed ({e}), invalidating all caches")
+                with self._lock:
+                    self._seen = {}
+                self._invalidate(list(self._subscribers))
+            await asyncio.sleep(self.interval)
+
+    def start(self, engine: AsyncEngine) -> None:
+        """Start polling on the running loop (once per worker)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(engine))
+            logger.info(f"🔄 Cache bus polling every {self.interval * 1000:.0f} ms")
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> dict:
+        """Snapshot of the poll and invalidation counters."""
+        return dict(self.stats)
+
+
+cache_bus = CacheBus(CACHE_SYNC_INTERVAL_MS / 1000)
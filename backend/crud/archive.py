@@ -0,0 +1,134 @@
+# ─────────────────────────────────────────────
+# 📂 crud/archive.py — Hot/Cold Booking Archival
+# ─────────────────────────────────────────────
+#
+# Finished bookings (done / cancelled) whose appointment is older than
+# ARCHIVE_AFTER_DAYS are moved from `booking` to `booking_archive`, so the
+# hot table and its indexes only grow with live bookings. Rows move in
+# batches of ARCHIVE_BATCH_SIZE, one short transaction each, with a pause
+# between batches so other writers get the lock. The daily rollup is left
+# as is: archived bookings still count in the dashboard.
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, delete, insert, literal
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel import select
+
+from models import Booking, BookingArchive
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+ARCHIVE_AFTER_DAYS     = int(os.getenv("ARCHIVE_AFTER_DAYS", 180))
+ARCHIVE_BATCH_SIZE     = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+ARCHIVE_BATCH_PAUSE_MS = int(os.getenv("ARCHIVE_BATCH_PAUSE_MS", 50))
+
+# Only bookings in these states are ever archived
+ARCHIVABLE_STATUSES = ("done", "cancelled")
+
+_COLUMNS = [column.name for column in Booking.__table__.columns]
+
+
+def archive_cutoff(older_than_days: int | None = None) -> datetime:
+    """Appointments before this instant are old enough to archive."""
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def _copy_batch_query(cutoff: datetime, batch_size: int):
+    """INSERT ... SELECT of one batch into the archive, returning the moved IDs."""
+    booking = Booking.__table__
+    eligible = (
+        select(*booking.columns, literal(datetime.now(timezone.utc), DateTime()).label("archived_at"))
+        .where(booking.c.status.in_(ARCHIVABLE_STATUSES))
+        .where(booking.c.appointment_time < cutoff)
+        .order_by(booking.c.appointment_time)
+        .limit(batch_size)
+    )
+    # The statement writes first, so it takes the writer lock before reading
+    return (
+        insert(BookingArchive)
+        .from_select([*_COLUMNS, "archived_at"], eligible)
+        .returning(BookingArchive.id)
+    )
+
+
+def _delete_query(booking_ids: list[int]):
+    return delete(Booking).where(Booking.id.in_(booking_ids))
+
+
+def _move_batch(conn: Connection, cutoff: datetime, batch_size: int) -> int:
+    ids = list(conn.execute(_copy_batch_query(cutoff, batch_size)).scalars())
+    if ids:
+        conn.execute(_delete_query(ids))
+    return len(ids)
+
+
+async def _move_batch_async(conn: AsyncConnection, cutoff: datetime, batch_size: int) -> int:
+    ids = list((await conn.execute(_copy_batch_query(cutoff, batch_size))).scalars())
+    if ids:
+        await conn.execute(_delete_query(ids))
+    return len(ids)
+
+
+def archive_bookings(
+    engine: Engine,
+    older_than_days: int | None = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: int | None = None,
+) -> tuple[int, int, datetime]:
+    """
+    Move finished, old bookings to `booking_archive`, batch by batch.
+
+    Each batch copies up to `batch_size` rows and deletes them from
+    `booking` in one transaction, so a crash never loses or duplicates a
+    booking and the write lock is only held for one batch at a time.
+
+    Args:
+        engine (Engine): Engine of the primary database.
+        older_than_days (int | None): Retention age (default ARCHIVE_AFTER_DAYS).
+        batch_size (int): Rows moved per transaction.
+        max_batches (int | None): Stop after this many batches (None = until done).
+
+    Returns:
+        tuple[int, int, datetime]: Rows archived, batches used, and the cutoff.
+    """
+    cutoff = archive_cutoff(older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        with engine.begin() as conn:
+            moved = _move_batch(conn, cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        time.sleep(ARCHIVE_BATCH_PAUSE_MS / 1000)
+    logger.info(f"🧊 Archived {total} bookings in {batches} batches (before {cutoff.isoformat()})")
+    return total, batches, cutoff
+
+
+async def archive_bookings_async(
+    engine: AsyncEngine,
+    older_than_days: int | None = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: int | None = None,
+) -> tuple[int, int, datetime]:
+    """Async version of `archive_bookings`."""
+    cutoff = archive_cutoff(older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        async with engine.begin() as conn:
+            moved = await _move_batch_async(conn, cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        await asyncio.sleep(ARCHIVE_BATCH_PAUSE_MS / 1000)
+    logger.info(f"🧊 Archived {total} bookings in {batches} batches (before {cutoff.isoformat()})")
+    return total, batches, cutoff
@@ -0,0 +1,259 @@
+# ─────────────────────────────────────────────
+# 📂 crud/availability.py — Slot Conflicts & Free Slots
+# ─────────────────────────────────────────────
+#
+# Each service is booked as its own resource: two active bookings of the
+# same service conflict when their [start, start + duration) ranges overlap.
+# Since every booking of a service shares its `duration_min`, an overlap
+# with a new booking starting at `t` exists iff some active booking starts
+# strictly inside (t - duration, t + duration) — a single range probe on
+# the (service_id, appointment_time) index, never a scan.
+
+import os
+from bisect import bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Booking, Service
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+BUSINESS_HOURS        = os.getenv("BUSINESS_HOURS", "09:00-17:00")
+BUSINESS_TIMEZONE     = ZoneInfo(os.getenv("BUSINESS_TIMEZONE", "UTC"))
+SLOT_STEP_MINUTES     = int(os.getenv("SLOT_STEP_MINUTES", 30))
+DEFAULT_DURATION_MIN  = int(os.getenv("DEFAULT_DURATION_MIN", 60))
+MAX_AVAILABILITY_DAYS = int(os.getenv("MAX_AVAILABILITY_DAYS", 31))
+
+# Bookings in these states hold their slot
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+_open_str, _close_str = BUSINESS_HOURS.split("-")
+OPENING_TIME = time.fromisoformat(_open_str.strip())
+CLOSING_TIME = time.fromisoformat(_close_str.strip())
+
+# Takes the writer lock on the service row before the overlap check, so
+# concurrent inserts for the same service are serialized (SQLite: database
+# write lock, PostgreSQL: row lock).
+_LOCK_SERVICE_SQL = text(
+    "UPDATE service SET active = active WHERE id = :service_id RETURNING duration_min, active"
+)
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a booking overlaps an active booking of the same service."""
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and normalize aware ones to UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def service_duration(service: Service) -> timedelta:
+    """Length of one booking of a service."""
+    return timedelta(minutes=service.duration_min or DEFAULT_DURATION_MIN)
+
+
+def _overlap_query(service_id: int, start: datetime, duration: timedelta, exclude_id: int | None = None):
+    query = (
+        select(Booking.id)
+        .where(Booking.service_id == service_id)
+        .where(Booking.appointment_time > start - duration)
+        .where(Booking.appointment_time < start + duration)
+        .where(Booking.status.in_(ACTIVE_STATUSES))
+        .limit(1)
+    )
+    if exclude_id is not None:
+        query = query.where(Booking.id != exclude_id)
+    return query
+
+
+def _busy_query(service_id: int, start: datetime, end: datetime, duration: timedelta):
+    return (
+        select(Booking.appointment_time)
+        .where(Booking.service_id == service_id)
+        .where(Booking.appointment_time > start - duration)
+        .where(Booking.appointment_time < end)
+        .where(Booking.status.in_(ACTIVE_STATUSES))
+        .order_by(Booking.appointment_time)
+    )
+
+
+def _duration_from_lock(row, service_id: int, new_booking: bool) -> timedelta:
+    if row is None:
+        raise ValueError(f"Unknown service (ID: {service_id})")
+    # Deactivated services keep their bookings but accept no new ones
+    if new_booking and not row.active:
+        raise ValueError(f"Service is not available for booking (ID: {service_id})")
+    return timedelta(minutes=row[0] or DEFAULT_DURATION_MIN)
+
+
+def _overlaps(busy_starts: list[datetime], start: datetime, duration: timedelta) -> bool:
+    """True if a slot starting at `start` overlaps any of the sorted busy starts."""
+    # First busy start after start - duration; a conflict iff it begins before start + duration
+    i = bisect_right(busy_starts, start - duration)
+    return i < len(busy_starts) and busy_starts[i] < start + duration
+
+
+def reserve_slot(session: Session, booking: Booking, new_booking: bool | None = None) -> timedelta:
+    """
+    Lock the booking's service and make sure its slot is still free.
+
+    Must run inside the transaction that inserts the booking, before
+    anything else is read, so the check and the insert are atomic.
+
+    Args:
+        session (Session): Active database session.
+        booking (Booking): Booking about to be inserted (or moved, if it has an ID).
+        new_booking (bool | None): Whether the booking is new to this service,
+            so a deactivated service refuses it (default: it has no ID yet).
+
+    Returns:
+        timedelta: Duration of one booking of the service.
+
+    Raises:
+        ValueError: If the service does not exist, or is deactivated and
+            the booking is new.
+        SlotUnavailableError: If the slot overlaps an active booking.
+    """
+    if new_booking is None:
+        new_booking = booking.id is None
+    row = session.execute(_LOCK_SERVICE_SQL, {"service_id": booking.service_id}).first()
+    duration = _duration_from_lock(row, booking.service_id, new_booking)
+    start = as_utc(booking.appointment_time)
+    if session.exec(_overlap_query(booking.service_id, start, duration, booking.id)).first():
+        logger.warning(f"⛔ Slot taken for service {booking.service_id} at {start.isoformat()}")
+        raise SlotUnavailableError("Requested time slot is not available")
+    return duration
+
+
+async def _lock_service_async(session: AsyncSession, service_id: int, new_booking: bool) -> timedelta:
+    result = await session.execute(_LOCK_SERVICE_SQL, {"service_id": service_id})
+    return _duration_from_lock(result.first(), service_id, new_booking)
+
+
+async def reserve_slot_async(session: AsyncSession, booking: Booking, new_booking: bool | None = None) -> timedelta:
+    """Async version of `reserve_slot`."""
+    if new_booking is None:
+        new_booking = booking.id is None
+    duration = await _lock_service_async(session, booking.service_id, new_booking)
+    start = as_utc(booking.appointment_time)
+    result = await session.exec(_overlap_query(booking.service_id, start, duration, booking.id))
+    if result.first():
+        logger.warning(f"⛔ Slot taken for service {booking.service_id} at {start.isoformat()}")
+        raise SlotUnavailableError("Requested time slot is not available")
+    return duration
+
+
+async def reserve_slots_async(session: AsyncSession, bookings: list[Booking]) -> list[Exception | None]:
+    """
+    Check a batch of new bookings against the database and each other.
+
+    Each distinct service is locked once (in ID order, so concurrent batches
+    cannot deadlock) and its busy starts over the batch window are read with
+    a single range query. Accepted bookings are added to the busy list, so
+    two items of the same batch cannot take the same slot either.
+
+    Args:
+        session (AsyncSession): Active database session, in the inserting transaction.
+        bookings (list[Booking]): Bookings about to be inserted.
+
+    Returns:
+        list[Exception | None]: Per-booking error (ValueError for an unknown or
+            deactivated service, SlotUnavailableError for a taken slot), or None if free.
+    """
+    errors: list[Exception | None] = [None] * len(bookings)
+    by_service = defaultdict(list)
+    for i, booking in enumerate(bookings):
+        by_service[booking.service_id].append(i)
+
+    for service_id in sorted(by_service):
+        indexes = by_service[service_id]
+        try:
+            duration = await _lock_service_async(session, service_id, new_booking=True)
+        except ValueError as e:
+            for i in indexes:
+                errors[i] = e
+            continue
+
+        starts = [as_utc(bookings[i].appointment_time) for i in indexes]
+        result = await session.exec(_busy_query(service_id, min(starts), max(starts) + duration, duration))
+        busy = [as_utc(t) for t in result.all()]
+
+        for i, start in zip(indexes, starts):
+            if _overlaps(busy, start, duration):
+                errors[i] = SlotUnavailableError("Requested time slot is not available")
+            else:
+                insort(busy, start)
+
+    return errors
+
+
+def _free_slots(busy_starts: list[datetime], start: datetime, end: datetime, duration: timedelta) -> list[tuple[datetime, datetime]]:
+    """
+    Walk the business-hour grid between `start` and `end` and keep the slots
+    that fit before closing time and overlap no busy booking.
+    """
+    step = timedelta(minutes=SLOT_STEP_MINUTES)
+    slots = []
+    day = start.astimezone(BUSINESS_TIMEZONE).date()
+    last_day = end.astimezone(BUSINESS_TIMEZONE).date()
+
+    while day <= last_day:
+        slot = datetime.combine(day, OPENING_TIME, BUSINESS_TIMEZONE).astimezone(timezone.utc)
+        closing = datetime.combine(day, CLOSING_TIME, BUSINESS_TIMEZONE).astimezone(timezone.utc)
+        while slot + duration <= closing:
+            if slot >= start and slot + duration <= end and not _overlaps(busy_starts, slot, duration):
+                slots.append((slot, slot + duration))
+            slot += step
+        day += timedelta(days=1)
+
+    return slots
+
+
+def _check_window(start: datetime, end: datetime) -> tuple[datetime, datetime]:
+    start, end = as_utc(start), as_utc(end)
+    if end <= start:
+        raise ValueError("'to' must be after 'from'")
+    if end - start > timedelta(days=MAX_AVAILABILITY_DAYS):
+        raise ValueError(f"Availability window is limited to {MAX_AVAILABILITY_DAYS} days")
+    return start, end
+
+
+def get_free_slots(session: Session, service: Service, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """
+    List bookable slots of a service within a time window.
+
+    Args:
+        session (Session): Active database session.
+        service (Service): Service to check.
+        start (datetime): Window start (naive values are taken as UTC).
+        end (datetime): Window end (naive values are taken as UTC).
+
+    Returns:
+        list[tuple[datetime, datetime]]: Free (start, end) slots, in UTC.
+
+    Raises:
+        ValueError: If the window is empty or too long.
+    """
+    start, end = _check_window(start, end)
+    duration = service_duration(service)
+    busy = [as_utc(t) for t in session.exec(_busy_query(service.id, start, end, duration)).all()]
+    return _free_slots(busy, start, end, duration)
+
+
+async def get_free_slots_async(session: AsyncSession, service: Service, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """Async version of `get_free_slots`."""
+    start, end = _check_window(start, end)
+    duration = service_duration(service)
+    result = await session.exec(_busy_query(service.id, start, end, duration))
+    busy = [as_utc(t) for t in result.all()]
+    return _free_slots(busy, start, end, duration)
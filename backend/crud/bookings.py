@@ -2,10 +2,45 @@
 # 📂 crud/bookings.py — Booking DB Operations
 # ─────────────────────────────────────────────
 
+import base64
+import json
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy import and_, insert, or_, union_all, update
 from sqlmodel import Session, select
-from models import Booking
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Booking, BookingArchive, BookingCreate, BookingRead, Service
+from crud.availability import ACTIVE_STATUSES, as_utc, reserve_slot, reserve_slot_async, reserve_slots_async
+from crud import idempotency, stats
 from logger import logger
 
+# Hard ceiling on page size, whatever the client asks for
+MAX_PAGE_SIZE = 200
+
+# Hard ceiling on bookings accepted by one batch request
+MAX_BATCH_SIZE = 1000
+
+# Target status → statuses a booking may move to it from
+STATUS_TRANSITIONS = {
+    "confirmed": ("pending",),
+    "done": ("confirmed",),
+    "cancelled": ("pending", "confirmed", "done"),
+}
+
+# Patched columns that can move a booking to another slot and rollup group
+SCHEDULE_FIELDS = frozenset({"service_id", "appointment_time"})
+
+# Columns included in bulk exports, in output order
+EXPORT_COLUMNS = (
+    "id", "name", "email", "phone", "service_id",
+    "message", "appointment_time", "status", "created_at",
+)
+
+# Column-only selects skip ORM instances (and the selectin service load)
+BOOKING_COLUMNS = tuple(Booking.__table__.columns)
+
 
 def get_all_bookings(session: Session) -> list[Booking]:
     """
@@ -21,6 +56,230 @@ def get_all_bookings(session: Session) -> list[Booking]:
     return session.exec(select(Booking)).all()
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(appointment_time: datetime, booking_id: int) -> str:
+    """
+    Build an opaque pagination cursor pointing just after a booking.
+
+    Args:
+        appointment_time (datetime): Appointment time of the last booking of the page.
+        booking_id (int): ID of that booking.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps({"t": appointment_time.isoformat(), "id": booking_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string received from the client.
+
+    Returns:
+        tuple[datetime, int]: The (appointment_time, id) keyset position.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return as_utc(datetime.fromisoformat(data["t"])), int(data["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _page_branch(
+    table,
+    status: str | None,
+    service_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    email: str | None,
+):
+    """Filtered, keyset-positioned select over one bookings table (unordered)."""
+    c = table.c
+    query = select(*(c[column.name] for column in BOOKING_COLUMNS))
+
+    if status:
+        query = query.where(c.status == status)
+    if service_id is not None:
+        query = query.where(c.service_id == service_id)
+    # Naive bounds are taken as UTC, like stored appointment times
+    if date_from:
+        query = query.where(c.appointment_time >= as_utc(date_from))
+    if date_to:
+        query = query.where(c.appointment_time < as_utc(date_to))
+    if email:
+        query = query.where(c.email == email)
+    return query, c
+
+
+def _page_order(c, descending: bool) -> tuple:
+    if descending:
+        return c.appointment_time.desc(), c.id.desc()
+    return c.appointment_time, c.id
+
+
+def _keyset(query, c, after: tuple[datetime, int] | None, descending: bool, limit: int):
+    """Apply the cursor position, order and look-ahead limit to one branch."""
+    if after:
+        after_time, after_id = after
+        if descending:
+            query = query.where(or_(
+                c.appointment_time < after_time,
+                and_(c.appointment_time == after_time, c.id < after_id),
+            ))
+        else:
+            query = query.where(or_(
+                c.appointment_time > after_time,
+                and_(c.appointment_time == after_time, c.id > after_id),
+            ))
+
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(*_page_order(c, descending)).limit(limit + 1)
+
+
+def _bookings_page_query(
+    limit: int,
+    cursor: str | None,
+    status: str | None,
+    service_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    email: str | None,
+    descending: bool,
+    include_archived: bool = False,
+):
+    """Build the keyset query behind `get_bookings_page` (fetches limit + 1 rows)."""
+    after = decode_cursor(cursor) if cursor else None
+    tables = [Booking.__table__] + ([BookingArchive.__table__] if include_archived else [])
+    branches = [
+        _keyset(*_page_branch(table, status, service_id, date_from, date_to, email), after, descending, limit)
+        for table in tables
+    ]
+    if len(branches) == 1:
+        return branches[0]
+
+    # Each side is an index range scan capped at limit + 1; merge them and keep the first rows
+    merged = union_all(*(select(*branch.subquery().c) for branch in branches)).subquery()
+    return select(*merged.c).order_by(*_page_order(merged.c, descending)).limit(limit + 1)
+
+
+def _split_page(rows, limit: int) -> tuple[list[dict], str | None]:
+    """Trim the extra look-ahead row and derive the next cursor from the page."""
+    has_more = len(rows) > limit
+    items = [dict(row._mapping) for row in rows[:limit]]
+    last = items[-1] if has_more else None
+    next_cursor = encode_cursor(last["appointment_time"], last["id"]) if last else None
+
+    logger.info(f"📥 Fetched bookings page ({len(items)} rows, more={has_more})")
+    return items, next_cursor
+
+
+def get_bookings_page(
+    session: Session,
+    limit: int = 50,
+    cursor: str | None = None,
+    status: str | None = None,
+    service_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    email: str | None = None,
+    descending: bool = False,
+    include_archived: bool = False,
+) -> tuple[list[dict], str | None]:
+    """
+    Retrieve one page of bookings using keyset pagination.
+
+    Rows are ordered by (appointment_time, id) so the order is stable and
+    each page is a bounded index range scan, however deep the cursor is.
+    Only the columns are selected: items are plain dicts, ready to serialize.
+
+    Args:
+        session (Session): Active database session.
+        limit (int): Maximum number of bookings to return.
+        cursor (str | None): Cursor returned with the previous page.
+        status (str | None): Only return bookings with this status.
+        service_id (int | None): Only return bookings for this service.
+        date_from (datetime | None): Only return appointments at or after this time.
+        date_to (datetime | None): Only return appointments before this time.
+        email (str | None): Only return bookings made with this exact email.
+        descending (bool): Newest appointments first when True.
+        include_archived (bool): Also page through `booking_archive`.
+
+    Returns:
+        tuple[list[dict], str | None]: The page and the cursor for the next one.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = _bookings_page_query(
+        limit, cursor, status, service_id, date_from, date_to, email, descending, include_archived
+    )
+    return _split_page(session.exec(query).all(), limit)
+
+
+def _export_query(
+    status: str | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+):
+    """Build the column-only query behind the bookings export."""
+    columns = [Booking.__table__.columns[name] for name in EXPORT_COLUMNS]
+    query = select(*columns).order_by(Booking.id)
+
+    if status:
+        query = query.where(Booking.status == status)
+    if date_from:
+        query = query.where(Booking.appointment_time >= as_utc(date_from))
+    if date_to:
+        query = query.where(Booking.appointment_time < as_utc(date_to))
+    return query
+
+
+def iter_booking_rows(
+    session: Session,
+    batch_size: int = 1000,
+    status: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> Iterator[dict]:
+    """
+    Stream bookings as plain dicts straight from a server-side cursor.
+
+    Only the export columns are selected (no ORM objects, no relationship
+    loading) and rows are fetched `batch_size` at a time, so memory stays
+    flat no matter how many bookings exist.
+
+    Args:
+        session (Session): Active database session, kept open while iterating.
+        batch_size (int): Number of rows buffered per fetch.
+        status (str | None): Only export bookings with this status.
+        date_from (datetime | None): Only export appointments at or after this time.
+        date_to (datetime | None): Only export appointments before this time.
+
+    Yields:
+        dict: One booking row keyed by `EXPORT_COLUMNS`.
+    """
+    query = _export_query(status, date_from, date_to)
+
+    logger.info("📤 Streaming bookings export")
+    result = session.exec(
+        query.execution_options(yield_per=batch_size, stream_results=True)
+    )
+    for row in result:
+        yield dict(zip(EXPORT_COLUMNS, row))
+
+
 def get_booking_by_id(session: Session, booking_id: int) -> Booking | None:
     """
     Retrieve a single booking by its ID.
@@ -40,47 +299,231 @@ def get_booking_by_id(session: Session, booking_id: int) -> Booking | None:
     return booking
 
 
-def create_booking(session: Session, booking: Booking) -> Booking:
+def get_archived_booking(session: Session, booking_id: int) -> BookingArchive | None:
+    """
+    Retrieve a booking that was moved to the archive table.
+
+    Args:
+        session (Session): Active database session.
+        booking_id (int): Original ID of the booking.
+
+    Returns:
+        BookingArchive | None: The archived booking or None if not found.
+    """
+    booking = session.get(BookingArchive, booking_id)
+    if booking:
+        logger.info(f"🧊 Archived booking found (ID: {booking_id})")
+    return booking
+
+
+def create_booking(session: Session, booking: Booking, idempotency_key: tuple[str, str] | None = None) -> Booking:
     """
     Add a new booking to the database.
 
+    The service is locked and checked for an overlapping active booking in
+    the same transaction as the insert, so concurrent requests cannot
+    double-book a slot.
+
     Args:
         session (Session): Active database session.
         booking (Booking): The booking object to insert.
+        idempotency_key (tuple[str, str] | None): (key, request fingerprint);
+            when given, the 201 response is stored under the key in the same
+            transaction (see crud/idempotency.py).
 
     Returns:
         Booking: The newly created and refreshed booking object.
+
+    Raises:
+        ValueError: If the booking's service does not exist.
+        SlotUnavailableError: If the requested slot is already taken.
     """
+    reserve_slot(session, booking)
     session.add(booking)
+    stats.apply_deltas(session, stats.transition(None, stats.stat_key(booking)))
+    if idempotency_key:
+        session.flush()
+        body = BookingRead.model_validate(booking).model_dump_json()
+        idempotency.remember(session, *idempotency_key, 201, body)
     session.commit()
     session.refresh(booking)
     logger.info(f"✅ Booking created (ID: {booking.id})")
     return booking
 
 
-def update_booking(session: Session, db_booking: Booking, updated_data: Booking) -> Booking:
+def update_booking(session: Session, booking_id: int, updated_data: BookingCreate) -> Booking | None:
     """
-    Update an existing booking with new data.
+    Replace every editable field of a booking.
+
+    Goes through `patch_booking`, so the row is locked and the slot is
+    checked exactly as for a partial update.
 
     Args:
         session (Session): Active database session.
-        db_booking (Booking): Existing booking from the DB.
-        updated_data (Booking): New data to apply.
+        booking_id (int): ID of the booking to update.
+        updated_data (BookingCreate): New data to apply.
 
     Returns:
-        Booking: The updated and refreshed booking object.
+        Booking | None: The updated booking, or None if it does not exist.
+
+    Raises:
+        ValueError: If the new service does not exist or is deactivated.
+        SlotUnavailableError: If the new slot overlaps an active booking.
     """
-    db_booking.name = updated_data.name
-    db_booking.email = updated_data.email
-    db_booking.phone = updated_data.phone
-    db_booking.service_id = updated_data.service_id
-    db_booking.message = updated_data.message
-    db_booking.appointment_time = updated_data.appointment_time
+    return patch_booking(session, booking_id, updated_data.model_dump())
+
+
+def _patch_query(booking_id: int, changes: dict):
+    return (
+        update(Booking)
+        .where(Booking.id == booking_id)
+        .values(**changes)
+        .returning(*BOOKING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _lock_booking_query(booking_id: int):
+    # No-op write: takes the writer lock before anything is read, then hands
+    # back the schedule the booking currently holds
+    return (
+        update(Booking)
+        .where(Booking.id == booking_id)
+        .values(id=Booking.id)
+        .returning(Booking.service_id, Booking.appointment_time, Booking.status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _moved_booking(booking_id: int, current, changes: dict) -> Booking:
+    """The booking's schedule once `changes` are applied, for the slot check."""
+    return Booking(
+        id=booking_id,
+        service_id=changes.get("service_id", current.service_id),
+        appointment_time=changes.get("appointment_time", current.appointment_time),
+        status=current.status,
+    )
+
+
+def patch_booking(session: Session, booking_id: int, changes: dict) -> Booking | None:
+    """
+    Apply a sparse update with a single `UPDATE ... RETURNING` statement.
+
+    Only the given columns are written and no ORM instance is loaded. When
+    the service or appointment time changes, the booking row is locked first
+    and the new slot is checked, as on creation.
 
+    Args:
+        session (Session): Active database session.
+        booking_id (int): ID of the booking to update.
+        changes (dict): Column → new value, only for the fields sent.
+
+    Returns:
+        Booking | None: The updated booking, or None if it does not exist.
+
+    Raises:
+        ValueError: If the new service does not exist, or is deactivated and
+            the booking is moving to it.
+        SlotUnavailableError: If the new slot overlaps an active booking.
+    """
+    if not changes:
+        return session.get(Booking, booking_id)
+
+    old_key = None
+    if changes.keys() & SCHEDULE_FIELDS:
+        current = session.execute(_lock_booking_query(booking_id)).first()
+        if current is None:
+            return None
+        old_key = (stats.stat_day(current.appointment_time), current.service_id, current.status)
+        moved = _moved_booking(booking_id, current, changes)
+        if moved.status in ACTIVE_STATUSES:
+            reserve_slot(session, moved, new_booking=moved.service_id != current.service_id)
+        elif session.get(Service, moved.service_id) is None:
+            raise ValueError(f"Unknown service (ID: {moved.service_id})")
+
+    row = session.execute(_patch_query(booking_id, changes)).first()
+    if row is None:
+        return None
+    booking = Booking(**row._mapping)
+    if old_key:
+        stats.apply_deltas(session, stats.transition(old_key, stats.stat_key(booking)))
+    session.commit()
+    logger.info(f"🩹 Booking patched (ID: {booking_id}, fields: {', '.join(sorted(changes))})")
+    return booking
+
+
+def _status_update_query(booking_ids: list[int], sources: tuple[str, ...], target: str):
+    return (
+        update(Booking)
+        .where(Booking.id.in_(booking_ids))
+        .where(Booking.status.in_(sources))
+        .values(status=target)
+        .returning(Booking.id, Booking.service_id, Booking.appointment_time)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _current_status_query(booking_ids: list[int], sources: tuple[str, ...]):
+    # No-op write: locks the matching rows and reports the status each one leaves
+    return (
+        update(Booking)
+        .where(Booking.id.in_(booking_ids))
+        .where(Booking.status.in_(sources))
+        .values(status=Booking.status)
+        .returning(Booking.id, Booking.status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _status_sources(target: str) -> tuple[str, ...]:
+    if target not in STATUS_TRANSITIONS:
+        raise ValueError(f"Unknown target status: {target!r}")
+    return STATUS_TRANSITIONS[target]
+
+
+def _status_deltas(rows, old_status: dict[int, str] | str, target: str) -> Counter:
+    deltas = Counter()
+    for booking_id, service_id, appointment_time in rows:
+        day = stats.stat_day(appointment_time)
+        old = old_status if isinstance(old_status, str) else old_status[booking_id]
+        deltas[(day, service_id, old)] -= 1
+        deltas[(day, service_id, target)] += 1
+    return deltas
+
+
+def set_bookings_status(session: Session, booking_ids: list[int], target: str) -> list[int]:
+    """
+    Move many bookings to a new status with one set-based UPDATE.
+
+    Only bookings whose current status allows the transition (see
+    `STATUS_TRANSITIONS`) are changed; the others are left untouched.
+    When the target has several possible source statuses (cancellation),
+    the rows are locked first to learn which status each one leaves, so the
+    daily rollup can be adjusted.
+
+    Args:
+        session (Session): Active database session.
+        booking_ids (list[int]): Bookings to move.
+        target (str): New status.
+
+    Returns:
+        list[int]: IDs of the bookings that changed, ascending.
+
+    Raises:
+        ValueError: If the target status is unknown.
+    """
+    sources = _status_sources(target)
+    if not booking_ids:
+        return []
+    old_status = sources[0]
+    if len(sources) > 1:
+        old_status = dict(session.execute(_current_status_query(booking_ids, sources)).all())
+    rows = session.execute(_status_update_query(booking_ids, sources, target)).all()
+    stats.apply_deltas(session, _status_deltas(rows, old_status, target))
     session.commit()
-    session.refresh(db_booking)
-    logger.info(f"✏️ Booking updated (ID: {db_booking.id})")
-    return db_booking
+    changed = sorted(row.id for row in rows)
+    logger.info(f"🔁 Bookings moved to {target} ({len(changed)}/{len(booking_ids)})")
+    return changed
 
 
 def delete_booking(session: Session, booking: Booking) -> None:
@@ -95,5 +538,198 @@ def delete_booking(session: Session, booking: Booking) -> None:
         None
     """
     session.delete(booking)
+    stats.apply_deltas(session, stats.transition(stats.stat_key(booking), None))
     session.commit()
     logger.info(f"🗑️ Booking deleted (ID: {booking.id})")
+
+
+# ─────────────────────────────────────────────
+# ⚡ Async variants — same behaviour, for AsyncSession callers
+# ─────────────────────────────────────────────
+
+async def get_all_bookings_async(session: AsyncSession) -> list[Booking]:
+    """Async version of `get_all_bookings`."""
+    logger.info("📥 Fetching all bookings")
+    result = await session.exec(select(Booking))
+    return result.all()
+
+
+async def get_bookings_page_async(
+    session: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    status: str | None = None,
+    service_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    email: str | None = None,
+    descending: bool = False,
+    include_archived: bool = False,
+) -> tuple[list[dict], str | None]:
+    """Async version of `get_bookings_page`."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = _bookings_page_query(
+        limit, cursor, status, service_id, date_from, date_to, email, descending, include_archived
+    )
+    result = await session.exec(query)
+    return _split_page(result.all(), limit)
+
+
+async def iter_booking_rows_async(
+    session: AsyncSession,
+    batch_size: int = 1000,
+    status: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> AsyncIterator[dict]:
+    """Async version of `iter_booking_rows`."""
+    query = _export_query(status, date_from, date_to)
+
+    logger.info("📤 Streaming bookings export")
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for row in result:
+        yield dict(zip(EXPORT_COLUMNS, row))
+
+
+async def get_booking_by_id_async(session: AsyncSession, booking_id: int) -> Booking | None:
+    """Async version of `get_booking_by_id`."""
+    booking = await session.get(Booking, booking_id)
+    if booking:
+        logger.info(f"📄 Booking found (ID: {booking_id})")
+    else:
+        logger.warning(f"⚠️ Booking not found (ID: {booking_id})")
+    return booking
+
+
+async def get_archived_booking_async(session: AsyncSession, booking_id: int) -> BookingArchive | None:
+    """Async version of `get_archived_booking`."""
+    booking = await session.get(BookingArchive, booking_id)
+    if booking:
+        logger.info(f"🧊 Archived booking found (ID: {booking_id})")
+    return booking
+
+
+async def create_booking_async(
+    session: AsyncSession,
+    booking: Booking,
+    idempotency_key: tuple[str, str] | None = None,
+) -> Booking:
+    """Async version of `create_booking`."""
+    await reserve_slot_async(session, booking)
+    session.add(booking)
+    await stats.apply_deltas_async(session, stats.transition(None, stats.stat_key(booking)))
+    if idempotency_key:
+        await session.flush()
+        body = BookingRead.model_validate(booking).model_dump_json()
+        await idempotency.remember_async(session, *idempotency_key, 201, body)
+    await session.commit()
+    await session.refresh(booking)
+    logger.info(f"✅ Booking created (ID: {booking.id})")
+    return booking
+
+
+async def insert_bookings_async(session: AsyncSession, bookings: list[Booking]) -> list[int | Exception]:
+    """
+    Check and insert many bookings, without committing.
+
+    Slots are checked for the whole list first (see `reserve_slots_async`);
+    the accepted rows are then written with one executemany
+    INSERT ... RETURNING, and the daily rollup is updated once.
+
+    Args:
+        session (AsyncSession): Active database session (committed by the caller).
+        bookings (list[Booking]): Validated bookings to insert.
+
+    Returns:
+        list[int | Exception]: For each booking, its new ID or the error
+            that rejected it (ValueError or SlotUnavailableError).
+    """
+    outcomes: list[int | Exception] = await reserve_slots_async(session, bookings)
+    accepted = [i for i, error in enumerate(outcomes) if error is None]
+
+    if accepted:
+        rows = [bookings[i].model_dump(exclude={"id"}) for i in accepted]
+        result = await session.execute(
+            insert(Booking).returning(Booking.id, sort_by_parameter_order=True), rows
+        )
+        for i, new_id in zip(accepted, result.scalars().all()):
+            outcomes[i] = new_id
+        await stats.apply_deltas_async(session, Counter(stats.stat_key(bookings[i]) for i in accepted))
+    return outcomes
+
+
+async def create_bookings_batch_async(session: AsyncSession, bookings: list[Booking]) -> list[int | str]:
+    """
+    Insert many bookings in a single transaction.
+
+    Args:
+        session (AsyncSession): Active database session.
+        bookings (list[Booking]): Validated bookings to insert.
+
+    Returns:
+        list[int | str]: For each booking, its new ID or the rejection reason.
+    """
+    outcomes = await insert_bookings_async(session, bookings)
+    await session.commit()
+
+    created = sum(1 for outcome in outcomes if isinstance(outcome, int))
+    logger.info(f"✅ Booking batch stored ({created}/{len(bookings)} created)")
+    return [outcome if isinstance(outcome, int) else str(outcome) for outcome in outcomes]
+
+
+async def update_booking_async(session: AsyncSession, booking_id: int, updated_data: BookingCreate) -> Booking | None:
+    """Async version of `update_booking`."""
+    return await patch_booking_async(session, booking_id, updated_data.model_dump())
+
+
+async def patch_booking_async(session: AsyncSession, booking_id: int, changes: dict) -> Booking | None:
+    """Async version of `patch_booking`."""
+    if not changes:
+        return await session.get(Booking, booking_id)
+
+    old_key = None
+    if changes.keys() & SCHEDULE_FIELDS:
+        current = (await session.execute(_lock_booking_query(booking_id))).first()
+        if current is None:
+            return None
+        old_key = (stats.stat_day(current.appointment_time), current.service_id, current.status)
+        moved = _moved_booking(booking_id, current, changes)
+        if moved.status in ACTIVE_STATUSES:
+            await reserve_slot_async(session, moved, new_booking=moved.service_id != current.service_id)
+        elif await session.get(Service, moved.service_id) is None:
+            raise ValueError(f"Unknown service (ID: {moved.service_id})")
+
+    row = (await session.execute(_patch_query(booking_id, changes))).first()
+    if row is None:
+        return None
+    booking = Booking(**row._mapping)
+    if old_key:
+        await stats.apply_deltas_async(session, stats.transition(old_key, stats.stat_key(booking)))
+    await session.commit()
+    logger.info(f"🩹 Booking patched (ID: {booking_id}, fields: {', '.join(sorted(changes))})")
+    return booking
+
+
+async def set_bookings_status_async(session: AsyncSession, booking_ids: list[int], target: str) -> list[int]:
+    """Async version of `set_bookings_status`."""
+    sources = _status_sources(target)
+    if not booking_ids:
+        return []
+    old_status = sources[0]
+    if len(sources) > 1:
+        result = await session.execute(_current_status_query(booking_ids, sources))
+        old_status = dict(result.all())
+    rows = (await session.execute(_status_update_query(booking_ids, sources, target))).all()
+    await stats.apply_deltas_async(session, _status_deltas(rows, old_status, target))
+    await session.commit()
+    changed = sorted(row.id for row in rows)
+    logger.info(f"🔁 Bookings moved to {target} ({len(changed)}/{len(booking_ids)})")
+    return changed
+
+
+async def delete_booking_async(session: AsyncSession, booking: Booking) -> None:
+    """Async version of `delete_booking`."""
+    await session.delete(booking)
+    await stats.apply_deltas_async(session, stats.transition(stats.stat_key(booking), None))
+    await session.commit()
+    logger.info(f"🗑️ Booking deleted (ID: {booking.id})")
@@ -0,0 +1,113 @@
+# ─────────────────────────────────────────────
+# 📂 crud/idempotency.py — Idempotency-Key Records
+# ─────────────────────────────────────────────
+#
+# A request sent with an `Idempotency-Key` header stores its response in the
+# `idempotency_key` table, in the same transaction as the write it made.
+# Retries with the same key get that stored response back without redoing
+# the write. Within a worker, concurrent requests with the same key queue on
+# an asyncio lock; across workers, the primary key lets only one of them
+# commit.
+
+import asyncio
+import hashlib
+import json
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import IdempotencyRecord
+from crud.availability import as_utc
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", 24))
+MAX_KEY_LENGTH = 255
+
+# key → [lock, number of requests holding or waiting for it]
+_key_locks: dict[str, list] = {}
+
+
+@asynccontextmanager
+async def key_lock(key: str):
+    """Serialize requests of this worker that share an idempotency key."""
+    entry = _key_locks.setdefault(key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            _key_locks.pop(key, None)
+
+
+def fingerprint(payload: dict) -> str:
+    """Stable hash of a request payload, to detect a key reused for another request."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+
+
+def _live(record: IdempotencyRecord | None) -> IdempotencyRecord | None:
+    if record is None or as_utc(record.created_at) < _cutoff():
+        return None
+    return record
+
+
+def get_record(session: Session, key: str) -> IdempotencyRecord | None:
+    """
+    Return the unexpired record stored for a key, if any.
+
+    Args:
+        session (Session): Active database session.
+        key (str): Scoped idempotency key.
+
+    Returns:
+        IdempotencyRecord | None: The stored response, or None.
+    """
+    return _live(session.get(IdempotencyRecord, key))
+
+
+async def get_record_async(session: AsyncSession, key: str) -> IdempotencyRecord | None:
+    """Async version of `get_record`."""
+    return _live(await session.get(IdempotencyRecord, key))
+
+
+def _purge_query():
+    return delete(IdempotencyRecord).where(IdempotencyRecord.created_at < _cutoff())
+
+
+def remember(session: Session, key: str, request_fingerprint: str, status_code: int, body: str) -> None:
+    """
+    Store a response under its key, in the caller's transaction.
+
+    Expired records are purged on the way (indexed range delete), so the
+    table stays bounded by the traffic of one TTL window.
+
+    Args:
+        session (Session): Active database session (not committed here).
+        key (str): Scoped idempotency key.
+        request_fingerprint (str): Fingerprint of the request payload.
+        status_code (int): HTTP status of the response.
+        body (str): JSON body of the response.
+    """
+    session.execute(_purge_query())
+    session.add(IdempotencyRecord(key=key, fingerprint=request_fingerprint, status_code=status_code, body=body))
+    logger.debug(f"🔑 Idempotency key stored ({key})")
+
+
+async def remember_async(session: AsyncSession, key: str, request_fingerprint: str, status_code: int, body: str) -> None:
+    """Async version of `remember`."""
+    await session.execute(_purge_query())
+    session.add(IdempotencyRecord(key=key, fingerprint=request_fingerprint, status_code=status_code, body=body))
+    logger.debug(f"🔑 Idempotency key stored ({key})")
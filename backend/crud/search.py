@@ -0,0 +1,113 @@
+# ─────────────────────────────────────────────
+# 📂 crud/search.py — Full-Text Booking Search
+# ─────────────────────────────────────────────
+#
+# On SQLite, `booking_fts` (an FTS5 index created by migration 4 and kept in
+# sync by triggers) covers the name, email, phone and message of every
+# booking. Searches are ranked with bm25 and only touch the index plus the
+# matching booking rows. Other databases fall back to a LIKE scan.
+
+import re
+
+from sqlalchemy import column, or_, table, text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Booking
+from crud.bookings import BOOKING_COLUMNS, MAX_PAGE_SIZE
+from logger import logger
+
+# Longest query accepted, and most terms used from it
+MAX_QUERY_LENGTH = 200
+MAX_QUERY_TERMS = 8
+
+_booking_fts = table("booking_fts", column("rowid"))
+
+# bm25 weights, in FTS column order: name, email, phone, message
+_FTS_RANK = text("bm25(booking_fts, 10.0, 8.0, 8.0, 1.0)")
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a free-text query into the words that are searched for."""
+    return _TERM_RE.findall(query[:MAX_QUERY_LENGTH].lower())[:MAX_QUERY_TERMS]
+
+
+def to_fts_query(terms: list[str]) -> str:
+    """
+    Build an FTS5 MATCH expression: every term must match, as a prefix.
+
+    Terms are quoted, so user input can never inject FTS syntax.
+    """
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _search_query(dialect: str, terms: list[str], limit: int, offset: int):
+    query = select(*BOOKING_COLUMNS)
+    if dialect == "sqlite":
+        query = (
+            query.select_from(_booking_fts)
+            .join(Booking, Booking.id == _booking_fts.c.rowid)
+            .where(text("booking_fts MATCH :match").bindparams(match=to_fts_query(terms)))
+            .order_by(_FTS_RANK, Booking.id)
+        )
+    else:
+        fields = (Booking.name, Booking.email, Booking.phone, Booking.message)
+        for term in terms:
+            query = query.where(or_(*(field.ilike(f"%{term}%") for field in fields)))
+        query = query.order_by(Booking.appointment_time.desc(), Booking.id)
+    # Fetch one extra row to know whether another page exists
+    return query.limit(limit + 1).offset(offset)
+
+
+def _split_results(rows, limit: int, offset: int) -> tuple[list[dict], int | None]:
+    has_more = len(rows) > limit
+    items = [dict(row._mapping) for row in rows[:limit]]
+    logger.info(f"🔎 Booking search returned {len(items)} rows (more={has_more})")
+    return items, offset + limit if has_more else None
+
+
+def search_bookings(
+    session: Session,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[dict], int | None]:
+    """
+    Find bookings whose name, email, phone or message match a free-text query.
+
+    Every word of the query must match the start of a word in one of those
+    fields ("ali mart" finds "Alice Martin"). Results are ranked by relevance.
+
+    Args:
+        session (Session): Active database session.
+        query (str): Free-text search query.
+        limit (int): Maximum number of bookings to return.
+        offset (int): Number of ranked results to skip.
+
+    Returns:
+        tuple[list[dict], int | None]: The matching bookings as plain dicts,
+            and the offset of the next page (None on the last page).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = session.exec(_search_query(session.get_bind().dialect.name, terms, limit, offset)).all()
+    return _split_results(rows, limit, offset)
+
+
+async def search_bookings_async(
+    session: AsyncSession,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[dict], int | None]:
+    """Async version of `search_bookings`."""
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    result = await session.exec(_search_query(session.bind.dialect.name, terms, limit, offset))
+    return _split_results(result.all(), limit, offset)
@@ -2,10 +2,108 @@
 # 📂 crud/services.py — Service DB Operations
 # ─────────────────────────────────────────────
 
+import gzip
+import hashlib
+import threading
+from typing import NamedTuple
+
+from sqlalchemy import delete, update
 from sqlmodel import Session, select
-from models import Service
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import BookingArchive, Service, ServiceCreate
+from crud import stats
+from cache_bus import cache_bus
+from responses import dumps
 from logger import logger
 
+# ─────────────────────────────────────────────
+# 🧊 Catalog cache — serialized GET /services bodies + their ETags
+# ─────────────────────────────────────────────
+_catalog_lock = threading.Lock()
+# "entries": include_inactive → Catalog; both variants come from one query
+_catalog_cache: dict = {"entries": None, "generation": 0}
+
+
+class Catalog(NamedTuple):
+    body: bytes      # JSON
+    etag: str        # quoted strong ETag of `body`
+    gzipped: bytes   # `body` gzip-compressed once, for clients that accept it
+
+# Cache namespace bumped by every service write (see cache_bus.py)
+CACHE_NAMESPACE = "services"
+
+# The catalog is built from plain column rows, never ORM instances
+_CATALOG_QUERY = select(*Service.__table__.columns).order_by(Service.id)
+
+
+def invalidate_catalog_cache() -> None:
+    """
+    Drop the cached service catalog so the next read rebuilds it.
+    Called after every service write, and by the cache bus when another
+    worker wrote.
+    """
+    with _catalog_lock:
+        _catalog_cache["entries"] = None
+        _catalog_cache["generation"] += 1
+    logger.debug("🧊 Service catalog cache invalidated")
+
+
+# Other workers' service writes reach this worker's catalog through the bus
+cache_bus.subscribe(CACHE_NAMESPACE, invalidate_catalog_cache)
+
+
+def _cached_catalog(include_inactive: bool) -> tuple[Catalog | None, int]:
+    """Return the cached catalog, if any, plus the generation it belongs to."""
+    with _catalog_lock:
+        entries = _catalog_cache["entries"]
+        return (entries[include_inactive] if entries else None), _catalog_cache["generation"]
+
+
+def _serialize(services: list[dict]) -> Catalog:
+    body = dumps(services)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return Catalog(body, etag, gzip.compress(body, mtime=0))
+
+
+def _store_catalog(rows, generation: int, include_inactive: bool) -> Catalog:
+    """
+    Serialize the catalog rows and cache them, unless a write happened meanwhile.
+
+    The generation captured before querying guards against caching a
+    catalog that a concurrent write has already made stale.
+    """
+    services = [dict(row._mapping) for row in rows]
+    entries = {
+        True: _serialize(services),
+        False: _serialize([service for service in services if service["active"]]),
+    }
+    with _catalog_lock:
+        if _catalog_cache["generation"] == generation:
+            _catalog_cache["entries"] = entries
+            logger.info(f"🧊 Service catalog cached ({len(services)} services)")
+    return entries[include_inactive]
+
+
+def get_catalog_json(session: Session, include_inactive: bool = False) -> Catalog:
+    """
+    Return the service catalog as pre-serialized JSON bytes.
+
+    The database is only queried when the cache is empty; afterwards the
+    same bytes (their strong ETag and a gzipped copy) are served until a
+    write invalidates them.
+
+    Args:
+        session (Session): Active database session, used only on a cache miss.
+        include_inactive (bool): Also list deactivated services.
+
+    Returns:
+        Catalog: The JSON body, its quoted ETag and its gzipped bytes.
+    """
+    cached, generation = _cached_catalog(include_inactive)
+    if cached is not None:
+        return cached
+    return _store_catalog(session.exec(_CATALOG_QUERY).all(), generation, include_inactive)
+
 
 def get_all_services(session: Session) -> list[Service]:
     """
@@ -52,38 +150,99 @@ def create_service(session: Session, service: Service) -> Service:
         Service: The newly created and refreshed service object.
     """
     session.add(service)
+    cache_bus.bump(session, CACHE_NAMESPACE)
     session.commit()
     session.refresh(service)
+    invalidate_catalog_cache()
     logger.info(f"✅ Service created (ID: {service.id})")
     return service
 
 
-def update_service(session: Session, db_service: Service, updated_data: Service) -> Service:
+def update_service(session: Session, db_service: Service, updated_data: ServiceCreate) -> Service:
     """
     Update an existing service with new data.
 
     Args:
         session (Session): Active database session.
         db_service (Service): Existing service from the DB.
-        updated_data (Service): New data to apply.
+        updated_data (ServiceCreate): New data to apply.
 
     Returns:
         Service: The updated and refreshed service object.
     """
-    db_service.name = updated_data.name
-    db_service.description = updated_data.description
-    db_service.price = updated_data.price
+    # A PUT replaces every field of the schema (omitted ones take their defaults)
+    for field, value in updated_data.model_dump().items():
+        setattr(db_service, field, value)
 
+    cache_bus.bump(session, CACHE_NAMESPACE)
     session.commit()
     session.refresh(db_service)
+    invalidate_catalog_cache()
     logger.info(f"✏️ Service updated (ID: {db_service.id})")
     return db_service
 
 
+def _patch_query(service_id: int, changes: dict):
+    return (
+        update(Service)
+        .where(Service.id == service_id)
+        .values(**changes)
+        .returning(*Service.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def patch_service(session: Session, service_id: int, changes: dict) -> Service | None:
+    """
+    Apply a sparse update with a single `UPDATE ... RETURNING` statement.
+
+    Args:
+        session (Session): Active database session.
+        service_id (int): ID of the service to update.
+        changes (dict): Column → new value, only for the fields sent.
+
+    Returns:
+        Service | None: The updated service, or None if it does not exist.
+    """
+    if not changes:
+        return session.get(Service, service_id)
+    row = session.execute(_patch_query(service_id, changes)).first()
+    if row is None:
+        return None
+    cache_bus.bump(session, CACHE_NAMESPACE)
+    session.commit()
+    invalidate_catalog_cache()
+    logger.info(f"🩹 Service patched (ID: {service_id}, fields: {', '.join(sorted(changes))})")
+    return Service(**row._mapping)
+
+
+def _delete_archived_query(service_id: int):
+    return delete(BookingArchive).where(BookingArchive.service_id == service_id)
+
+
+def deactivate_service(session: Session, service_id: int) -> Service | None:
+    """
+    Soft-delete a service: hide it from the catalog and refuse new bookings,
+    while keeping it and its booking history.
+
+    Args:
+        session (Session): Active database session.
+        service_id (int): ID of the service to deactivate.
+
+    Returns:
+        Service | None: The deactivated service, or None if it does not exist.
+    """
+    return patch_service(session, service_id, {"active": False})
+
+
 def delete_service(session: Session, service: Service) -> None:
     """
     Permanently delete a service from the database.
 
+    Its bookings go with it through the database's ON DELETE CASCADE, in
+    the same statement; they are never loaded. Archived bookings and the
+    service's rollup rows are removed too.
+
     Args:
         session (Session): Active database session.
         service (Service): Service object to delete.
@@ -92,5 +251,93 @@ def delete_service(session: Session, service: Service) -> None:
         None
     """
     session.delete(service)
+    session.exec(_delete_archived_query(service.id))
+    stats.forget_service(session, service.id)
+    cache_bus.bump(session, CACHE_NAMESPACE)
     session.commit()
+    invalidate_catalog_cache()
+    logger.info(f"🗑️ Service deleted (ID: {service.id})")
+
+
+# ─────────────────────────────────────────────
+# ⚡ Async variants — same behaviour, for AsyncSession callers
+# ─────────────────────────────────────────────
+
+async def get_catalog_json_async(session: AsyncSession, include_inactive: bool = False) -> Catalog:
+    """Async version of `get_catalog_json`."""
+    cached, generation = _cached_catalog(include_inactive)
+    if cached is not None:
+        return cached
+    result = await session.exec(_CATALOG_QUERY)
+    return _store_catalog(result.all(), generation, include_inactive)
+
+
+async def get_all_services_async(session: AsyncSession) -> list[Service]:
+    """Async version of `get_all_services`."""
+    logger.info("📥 Fetching all services")
+    result = await session.exec(select(Service))
+    return result.all()
+
+
+async def get_service_by_id_async(session: AsyncSession, service_id: int) -> Service | None:
+    """Async version of `get_service_by_id`."""
+    service = await session.get(Service, service_id)
+    if service:
+        logger.info(f"📄 Service found (ID: {service_id})")
+    else:
+        logger.warning(f"⚠️ Service not found (ID: {service_id})")
+    return service
+
+
+async def create_service_async(session: AsyncSession, service: Service) -> Service:
+    """Async version of `create_service`."""
+    session.add(service)
+    await cache_bus.bump_async(session, CACHE_NAMESPACE)
+    await session.commit()
+    await session.refresh(service)
+    invalidate_catalog_cache()
+    logger.info(f"✅ Service created (ID: {service.id})")
+    return service
+
+
+async def update_service_async(session: AsyncSession, db_service: Service, updated_data: ServiceCreate) -> Service:
+    """Async version of `update_service`."""
+    for field, value in updated_data.model_dump().items():
+        setattr(db_service, field, value)
+
+    await cache_bus.bump_async(session, CACHE_NAMESPACE)
+    await session.commit()
+    await session.refresh(db_service)
+    invalidate_catalog_cache()
+    logger.info(f"✏️ Service updated (ID: {db_service.id})")
+    return db_service
+
+
+async def patch_service_async(session: AsyncSession, service_id: int, changes: dict) -> Service | None:
+    """Async version of `patch_service`."""
+    if not changes:
+        return await session.get(Service, service_id)
+    row = (await session.execute(_patch_query(service_id, changes))).first()
+    if row is None:
+        return None
+    await cache_bus.bump_async(session, CACHE_NAMESPACE)
+    await session.commit()
+    invalidate_catalog_cache()
+    logger.info(f"🩹 Service patched (ID: {service_id}, fields: {', '.join(sorted(changes))})")
+    return Service(**row._mapping)
+
+
+async def deactivate_service_async(session: AsyncSession, service_id: int) -> Service | None:
+    """Async version of `deactivate_service`."""
+    return await patch_service_async(session, service_id, {"active": False})
+
+
+async def delete_service_async(session: AsyncSession, service: Service) -> None:
+    """Async version of `delete_service`."""
+    await session.delete(service)
+    await session.exec(_delete_archived_query(service.id))
+    await stats.forget_service_async(session, service.id)
+    await cache_bus.bump_async(session, CACHE_NAMESPACE)
+    await session.commit()
+    invalidate_catalog_cache()
     logger.info(f"🗑️ Service deleted (ID: {service.id})")
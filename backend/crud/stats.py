@@ -0,0 +1,197 @@
+# ─────────────────────────────────────────────
+# 📂 crud/stats.py — Booking Rollups for the Admin Dashboard
+# ─────────────────────────────────────────────
+#
+# `booking_daily_stat` holds one row per (appointment day, service, status)
+# with a booking count. Every booking write in crud/bookings.py applies a
+# ±1 delta to it inside the same transaction, so dashboard queries read
+# O(days) rows instead of every booking. Revenue is not stored: it is
+# priced when read (count × the service's current price), so a price change
+# can never make a later -1 subtract a different amount than its +1 added.
+
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import Date, bindparam, delete, text, union_all
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Booking, BookingArchive, BookingDailyStat, Service
+from crud.availability import BUSINESS_TIMEZONE, as_utc
+from logger import logger
+
+# Upsert a count delta
+_APPLY_DELTA_SQL = text(
+    "INSERT INTO booking_daily_stat (day, service_id, status, count) "
+    "VALUES (:day, :service_id, :status, :delta) "
+    "ON CONFLICT (day, service_id, status) DO UPDATE SET "
+    "  count = booking_daily_stat.count + excluded.count"
+).bindparams(bindparam("day", type_=Date))
+
+# (day, service_id, status) → count delta
+StatKey = tuple[date, int, str]
+
+
+def stat_day(appointment_time: datetime) -> date:
+    """Day a booking is counted under (its appointment date, business timezone)."""
+    return as_utc(appointment_time).astimezone(BUSINESS_TIMEZONE).date()
+
+
+def stat_key(booking: Booking) -> StatKey:
+    return stat_day(booking.appointment_time), booking.service_id, booking.status
+
+
+def _delta_params(deltas: Counter) -> list[dict]:
+    return [
+        {"day": day, "service_id": service_id, "status": status, "delta": delta}
+        for (day, service_id, status), delta in deltas.items()
+        if delta
+    ]
+
+
+def apply_deltas(session: Session, deltas: Counter) -> None:
+    """
+    Add booking count deltas to the rollup, in the caller's transaction.
+
+    Args:
+        session (Session): Active database session (not committed here).
+        deltas (Counter): (day, service_id, status) → change in booking count.
+    """
+    params = _delta_params(deltas)
+    if params:
+        session.execute(_APPLY_DELTA_SQL, params)
+
+
+async def apply_deltas_async(session: AsyncSession, deltas: Counter) -> None:
+    """Async version of `apply_deltas`."""
+    params = _delta_params(deltas)
+    if params:
+        await session.execute(_APPLY_DELTA_SQL, params)
+
+
+def transition(old: StatKey | None, new: StatKey | None) -> Counter:
+    """Deltas for a booking moving from one group to another (None = absent)."""
+    deltas = Counter()
+    if old is not None:
+        deltas[old] -= 1
+    if new is not None:
+        deltas[new] += 1
+    return deltas
+
+
+def forget_service(session: Session, service_id: int) -> None:
+    """Drop all rollup rows of a service whose bookings are being deleted with it."""
+    session.exec(delete(BookingDailyStat).where(BookingDailyStat.service_id == service_id))
+
+
+async def forget_service_async(session: AsyncSession, service_id: int) -> None:
+    """Async version of `forget_service`."""
+    await session.exec(delete(BookingDailyStat).where(BookingDailyStat.service_id == service_id))
+
+
+def rebuild_booking_stats(conn: Connection) -> int:
+    """
+    Recompute the whole rollup from the booking and booking_archive tables.
+
+    Used by the migration that introduces the rollup and as a repair tool.
+    Rows are streamed, so memory stays bounded by the number of groups.
+
+    Args:
+        conn (Connection): Connection inside an open transaction.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+    counts = Counter()
+    # Archived bookings still count in the dashboard
+    rows = conn.execute(
+        union_all(*(
+            select(table.c.appointment_time, table.c.service_id, table.c.status)
+            for table in (Booking.__table__, BookingArchive.__table__)
+        )).execution_options(yield_per=5000)
+    )
+    for appointment_time, service_id, status in rows:
+        counts[(stat_day(appointment_time), service_id, status)] += 1
+
+    conn.execute(delete(BookingDailyStat))
+    if counts:
+        conn.execute(BookingDailyStat.__table__.insert(), [
+            {"day": day, "service_id": service_id, "status": status, "count": count}
+            for (day, service_id, status), count in counts.items()
+        ])
+    logger.info(f"📊 Booking rollup rebuilt ({len(counts)} rows)")
+    return len(counts)
+
+
+async def get_dashboard_stats_async(
+    session: AsyncSession,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict:
+    """
+    Summarize bookings for the admin dashboard from the rollup table.
+
+    Revenue is each group's count times the service's current price.
+
+    Args:
+        session (AsyncSession): Active database session.
+        date_from (date | None): First appointment day to include.
+        date_to (date | None): Last appointment day to include.
+
+    Returns:
+        dict: Totals plus breakdowns by status, by service and by day.
+            Revenue never counts cancelled bookings, so every breakdown
+            sums to the total.
+    """
+    query = (
+        select(
+            BookingDailyStat.day,
+            BookingDailyStat.service_id,
+            BookingDailyStat.status,
+            BookingDailyStat.count,
+            Service.price,
+            Service.name,
+        )
+        .join(Service, Service.id == BookingDailyStat.service_id, isouter=True)
+        .where(BookingDailyStat.count != 0)
+    )
+    if date_from:
+        query = query.where(BookingDailyStat.day >= date_from)
+    if date_to:
+        query = query.where(BookingDailyStat.day <= date_to)
+    rows = (await session.exec(query.order_by(BookingDailyStat.day))).all()
+
+    by_status: dict[str, dict] = {}
+    by_service: dict[int, dict] = {}
+    by_day: dict[str, dict] = {}
+    total = {"bookings": 0, "revenue": 0.0}
+
+    names: dict[int, str | None] = {}
+    for day, service_id, status, count, price, name in rows:
+        names[service_id] = name
+        billable = count * (price or 0.0) if status != "cancelled" else 0.0
+        total["bookings"] += count
+        total["revenue"] += billable
+
+        group = by_status.setdefault(status, {"bookings": 0, "revenue": 0.0})
+        group["bookings"] += count
+        group["revenue"] += billable
+
+        group = by_service.setdefault(service_id, {"service_id": service_id, "bookings": 0, "revenue": 0.0})
+        group["bookings"] += count
+        group["revenue"] += billable
+
+        group = by_day.setdefault(day.isoformat(), {"day": day.isoformat(), "bookings": 0, "revenue": 0.0})
+        group["bookings"] += count
+        group["revenue"] += billable
+
+    for service_id, group in by_service.items():
+        group["name"] = names.get(service_id)
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_service": list(by_service.values()),
+        "by_day": list(by_day.values()),
+    }
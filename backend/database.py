@@ -1,32 +1,170 @@
+import os
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from logger import logger
+from migrations import create_tables, run_migrations
 
 # ─────────────────────────────────────────────
-# 🗃️ Database configuration
+# 🗃️ Database configuration (all overridable from the environment)
 # ─────────────────────────────────────────────
 
-# SQLite path — switch to PostgreSQL later by replacing the URI
-DATABASE_URL = "sqlite:///database.db"
+# SQLite by default — point DATABASE_URL at PostgreSQL etc. in production
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///database.db")
 
-# Create the engine (manages the DB connection pool)
-engine = create_engine(
-    DATABASE_URL,
-    echo=True  # Set to False in production to hide raw SQL queries
-)
+# Optional replica / read-only URL for read-heavy routes (defaults to the primary)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or DATABASE_URL
+
+# Log every SQL statement — only useful while debugging
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+# Connection pool sizing (ignored for in-memory SQLite)
+DB_POOL_SIZE     = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW  = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE  = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds
+
+# SQLite tuning, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_MMAP_SIZE       = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))  # bytes
+SQLITE_CACHE_SIZE      = int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024))        # negative = KiB
+
+# ─────────────────────────────────────────────
+# ⚡ Async driver mapping
+# ─────────────────────────────────────────────
+
+# Sync driver prefix → async driver prefix
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "mysql://": "mysql+aiomysql://",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Translate a sync database URL to its async-driver equivalent.
+
+    URLs that already name a driver (e.g. "postgresql+psycopg://") are
+    returned unchanged.
+    """
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# Override with ASYNC_DATABASE_URL to pick a different async driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL") or to_async_url(DATABASE_READ_URL)
+
+# ─────────────────────────────────────────────
+# 🏭 Engine factory
+# ─────────────────────────────────────────────
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def _install_sqlite_pragmas(sync_engine: Engine, read_only: bool) -> None:
+    """
+    Tune every new SQLite connection of an engine.
+
+    WAL lets readers proceed while the booking writer holds its lock,
+    synchronous=NORMAL is durable under WAL with far fewer fsyncs,
+    busy_timeout makes writers queue instead of failing immediately, and
+    foreign_keys turns on FK checks and ON DELETE CASCADE (off by default
+    in SQLite, and only settable per connection).
+    """
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def _engine_kwargs(url: str) -> dict:
+    """Build the create_engine keyword arguments shared by sync and async engines."""
+    kwargs = {"echo": DB_ECHO}
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+    return kwargs
+
+
+def create_db_engine(url: str, read_only: bool = False) -> Engine:
+    """
+    Create a sync engine configured from the environment.
+
+    Args:
+        url (str): Database URL.
+        read_only (bool): Refuse writes on this engine (SQLite query_only).
+
+    Returns:
+        Engine: The configured engine.
+    """
+    db_engine = create_engine(url, **_engine_kwargs(url))
+    if _is_sqlite(url):
+        _install_sqlite_pragmas(db_engine, read_only)
+    return db_engine
+
+
+def create_async_db_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    """
+    Create an async engine configured from the environment.
+
+    Args:
+        url (str): Async database URL (e.g. "sqlite+aiosqlite:///...").
+        read_only (bool): Refuse writes on this engine (SQLite query_only).
+
+    Returns:
+        AsyncEngine: The configured engine.
+    """
+    db_engine = create_async_engine(url, **_engine_kwargs(url))
+    if _is_sqlite(url):
+        _install_sqlite_pragmas(db_engine.sync_engine, read_only)
+    return db_engine
+
+
+# Primary engines (reads + writes)
+engine = create_db_engine(DATABASE_URL)
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+
+# Read-only engines: a separate pool so readers never queue behind writers
+read_engine = create_db_engine(DATABASE_READ_URL, read_only=True)
+async_read_engine = create_async_db_engine(ASYNC_DATABASE_READ_URL, read_only=True)
 
 # ─────────────────────────────────────────────
-# 📦 Initialize the database (create tables)
+# 📦 Initialize the database (create tables + migrate)
 # ─────────────────────────────────────────────
 
 def init_db() -> None:
     """
-    Initializes the database by creating all tables defined in SQLModel models.
+    Initializes the database by creating all tables defined in SQLModel models,
+    then applies pending schema migrations (see migrations.py).
     Use this at app startup. Fails loudly if DB is misconfigured.
     """
     try:
-        SQLModel.metadata.create_all(engine)
+        create_tables(engine, SQLModel.metadata)
+        run_migrations(engine)
         logger.info("✅ Database initialized successfully.")
     except SQLAlchemyError as e:
         logger.error(f"❌ Database initialization failed: {e}")
@@ -43,3 +181,22 @@ def get_session():
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    FastAPI dependency that yields an async database session.
+    Objects stay usable after commit so routes can serialize them
+    without triggering lazy loads.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session():
+    """
+    FastAPI dependency that yields an async session on the read-only engine.
+    Use it for routes that never write.
+    """
+    async with AsyncSession(async_read_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,161 @@
+# ─────────────────────────────────────────────
+# 🧺 group_commit.py — Write-Behind Group Commit for Booking Inserts
+# ─────────────────────────────────────────────
+#
+# Optional (BOOKING_GROUP_COMMIT=true). Instead of one transaction per
+# POST /bookings, requests hand their booking to a single writer task per
+# worker. The writer takes whatever is queued, waits up to
+# GROUP_COMMIT_MAX_DELAY_MS for more (at most GROUP_COMMIT_MAX_ROWS), and
+# stores the whole group with one slot check pass, one executemany INSERT
+# and one commit. Each request is resolved with its own ID or error only
+# after that commit, so a 201 still means the booking is durable.
+
+import asyncio
+import os
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import async_engine
+from models import Booking, BookingRead
+from crud import bookings as crud_bookings
+from crud import idempotency
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+BOOKING_GROUP_COMMIT      = os.getenv("BOOKING_GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_MAX_ROWS     = int(os.getenv("GROUP_COMMIT_MAX_ROWS", 64))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", 2))
+
+# (booking, idempotency key or None, future resolved with the stored booking)
+_Pending = tuple[Booking, tuple[str, str] | None, asyncio.Future]
+
+_STOP = None
+
+
+class BookingGroupWriter:
+    """Single writer task that commits queued bookings in groups."""
+
+    def __init__(self, max_rows: int, max_delay: float):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.groups = 0
+        self.rows = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_started(self) -> None:
+        # Started lazily, on the loop that serves requests
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+            logger.info("🧺 Booking group-commit writer started")
+
+    async def submit(self, booking: Booking, idempotency_key: tuple[str, str] | None = None) -> Booking:
+        """
+        Queue a booking and wait until the group holding it is committed.
+
+        Args:
+            booking (Booking): Validated booking to insert.
+            idempotency_key (tuple[str, str] | None): (key, request fingerprint)
+                to store the response under, as in `create_booking_async`.
+
+        Returns:
+            Booking: The booking, with its new ID.
+
+        Raises:
+            ValueError: If the booking's service does not exist.
+            SlotUnavailableError: If the requested slot is already taken.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((booking, idempotency_key, future))
+        return await future
+
+    async def stop(self) -> None:
+        """Commit whatever is still queued, then stop the writer task."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        logger.info(f"🧺 Booking group-commit writer stopped ({self.rows} rows in {self.groups} groups)")
+
+    async def _collect(self, first: _Pending) -> tuple[list[_Pending], bool]:
+        """Gather a group starting with `first`; also report whether to stop."""
+        group = [first]
+        deadline = self._loop.time() + self.max_delay
+        while len(group) < self.max_rows:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return group, True
+            group.append(item)
+        return group, False
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            group, stop = await self._collect(first)
+            try:
+                await self._commit_group(group)
+            except Exception as e:
+                # One bad row (e.g. an idempotency-key race) must not fail the others
+                logger.warning(f"⚠️ Group commit of {len(group)} bookings failed ({e}), retrying one by one")
+                for pending in group:
+                    await self._commit_one(pending)
+            if stop:
+                return
+
+    async def _commit_group(self, group: list[_Pending]) -> None:
+        bookings = [booking for booking, _, _ in group]
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            outcomes = await crud_bookings.insert_bookings_async(session, bookings)
+            for (booking, key, _), outcome in zip(group, outcomes):
+                if isinstance(outcome, int) and key:
+                    booking.id = outcome
+                    body = BookingRead.model_validate(booking).model_dump_json()
+                    await idempotency.remember_async(session, *key, 201, body)
+            await session.commit()
+
+        self.groups += 1
+        self.rows += len(group)
+        logger.debug(f"🧺 Committed a group of {len(group)} bookings")
+        for (booking, _, future), outcome in zip(group, outcomes):
+            if future.done():  # the request went away meanwhile
+                continue
+            if isinstance(outcome, int):
+                booking.id = outcome
+                future.set_result(booking)
+            else:
+                future.set_exception(outcome)
+
+    async def _commit_one(self, pending: _Pending) -> None:
+        booking, key, future = pending
+        booking.id = None
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            try:
+                result = await crud_bookings.create_booking_async(session, booking, key)
+            except Exception as e:
+                await session.rollback()
+                if not future.done():
+                    future.set_exception(e)
+                return
+        if not future.done():
+            future.set_result(result)
+
+
+booking_writer = BookingGroupWriter(GROUP_COMMIT_MAX_ROWS, GROUP_COMMIT_MAX_DELAY_MS / 1000)
@@ -1,16 +1,31 @@
 # ─────────────────────────────────────────────
 # 📝 logger.py — Central Logging Configuration
 # ─────────────────────────────────────────────
+#
+# Request threads never do log I/O: the `app` logger only has a QueueHandler,
+# and a QueueListener thread drains the queue into the console and file
+# handlers. Records are enriched with the current request's id/route on the
+# way in, and noisy levels can be sampled before they are even queued.
 
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # ─────────────────────────────────────────────
 # 🌍 Load configuration from environment
 # ─────────────────────────────────────────────
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_FILE = os.getenv("LOG_FILE", "logs/app.log")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()      # "text" or "json"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")              # e.g. "INFO=0.1,DEBUG=0.01"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
 
 # ─────────────────────────────────────────────
 # 📁 Ensure log directory exists
@@ -20,19 +35,76 @@ if log_dir and not os.path.exists(log_dir):
     os.makedirs(log_dir)
 
 # ─────────────────────────────────────────────
-# 🧱 Create root logger
+# 🧵 Per-request context (set by RequestContextMiddleware)
 # ─────────────────────────────────────────────
-logger = logging.getLogger("app")
-logger.setLevel(LOG_LEVEL)
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+route_var: ContextVar[str | None] = ContextVar("route", default=None)
+
+
+class ContextFilter(logging.Filter):
+    """Stamp each record with the current request id and route."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        if not hasattr(record, "route"):
+            record.route = route_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records for selected levels.
+
+    Rates come from a spec like "INFO=0.1,DEBUG=0.01"; levels that are not
+    listed are always kept, and WARNING and above are never sampled.
+    """
+
+    def __init__(self, spec: str):
+        super().__init__()
+        self.rates = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            level, _, rate = part.partition("=")
+            self.rates[logging.getLevelName(level.strip().upper())] = float(rate)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.levelno)
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including request context when present."""
+
+    CONTEXT_FIELDS = ("request_id", "route", "method", "status_code", "latency_ms")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+if LOG_FORMAT == "json":
+    formatter = JsonFormatter()
+else:
+    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
 
 # ─────────────────────────────────────────────
 # 📤 Console Handler
 # ─────────────────────────────────────────────
 console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter(
-    "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-))
-logger.addHandler(console_handler)
+console_handler.setFormatter(formatter)
 
 # ─────────────────────────────────────────────
 # 💾 Rotating File Handler
@@ -42,7 +114,86 @@ file_handler = RotatingFileHandler(
     maxBytes=5 * 1024 * 1024,  # 5 MB
     backupCount=3
 )
-file_handler.setFormatter(logging.Formatter(
-    "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-))
-logger.addHandler(file_handler)
+file_handler.setFormatter(formatter)
+
+# ─────────────────────────────────────────────
+# 📬 Queue → background listener (all I/O happens off the request thread)
+# ─────────────────────────────────────────────
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+queue_handler = _DroppingQueueHandler(log_queue)
+queue_handler.addFilter(SamplingFilter(LOG_SAMPLING))
+queue_handler.addFilter(ContextFilter())
+
+listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
+
+# ─────────────────────────────────────────────
+# 🧱 Create root logger
+# ─────────────────────────────────────────────
+logger = logging.getLogger("app")
+logger.setLevel(LOG_LEVEL)
+logger.addHandler(queue_handler)
+
+# ─────────────────────────────────────────────
+# 🪪 Request context middleware (pure ASGI)
+# ─────────────────────────────────────────────
+class RequestContextMiddleware:
+    """
+    Assign each HTTP request an id (reusing X-Request-ID when sent), expose
+    it in the response headers, and log one access line with its latency.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex
+        id_token = request_id_var.set(request_id)
+        route_token = route_var.set(scope["path"])
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            route = scope.get("route")  # set by the router once matched
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            logger.info(
+                f"➡️ {scope['method']} {scope['path']} → {status_code} ({latency_ms} ms)",
+                extra={
+                    "route": getattr(route, "path", scope["path"]),
+                    "method": scope["method"],
+                    "status_code": status_code,
+                    "latency_ms": latency_ms,
+                },
+            )
+            request_id_var.reset(id_token)
+            route_var.reset(route_token)
@@ -5,23 +5,55 @@
 from dotenv import load_dotenv
 load_dotenv()  # ✅ Must be called first!
 
+import asyncio
+import startup_timing  # first, so its clock covers every import below
+from startup_timing import phase
+
 import os
-from fastapi import FastAPI
-from starlette.middleware.sessions import SessionMiddleware
-from fastapi.middleware.cors import CORSMiddleware
+with phase("import_fastapi"):
+    from fastapi import Depends, FastAPI
+    from fastapi.responses import RedirectResponse
+    from starlette.middleware.gzip import GZipMiddleware
+    from starlette.middleware.sessions import SessionMiddleware
+    from fastapi.middleware.cors import CORSMiddleware
+
+with phase("import_core"):
+    from database import init_db, engine, async_engine, read_engine, async_read_engine
+    from metrics import MetricsMiddleware, instrument_engine, track_in_flight
+    from group_commit import booking_writer
+    from cache_bus import cache_bus
+    from responses import COMPRESS_LEVEL, COMPRESS_MIN_BYTES
+    from static import FRONTEND_DIR, FRONTEND_PATH, PrecompressedStaticFiles, precompress_frontend
+    from logger import logger, RequestContextMiddleware
 
-from database import init_db
-from routes import services, bookings, auth, admin  # These may access env vars
-from logger import logger
+# Routers are timed one by one (each also pays for the modules it imports first)
+with phase("import_routes_services"):
+    from routes import services
+with phase("import_routes_bookings"):
+    from routes import bookings
+with phase("import_routes_auth"):
+    from routes import auth
+with phase("import_routes_admin"):
+    from routes import admin
 
 # ─────────────────────────────────────────────
 # ⚙️ Custom startup/shutdown lifespan handler
 # ─────────────────────────────────────────────
 async def lifespan(app: FastAPI):
     logger.info("🔧 Initializing database...")
-    init_db()
+    with phase("init_db"):
+        init_db()
+    with phase("precompress_static"):
+        precompress_frontend()
+    cache_bus.start(async_read_engine)  # pick up other workers' writes
+    # Fetch the OAuth discovery document off the request path
+    oauth_warm_up = asyncio.get_running_loop().create_task(auth.warm_up_oauth())
+    logger.info(startup_timing.mark_ready())
     yield
     logger.info("🧹 Shutting down app...")
+    oauth_warm_up.cancel()
+    await cache_bus.stop()
+    await booking_writer.stop()  # commit bookings still queued for group commit
 
 # ─────────────────────────────────────────────
 # 🚀 Create FastAPI instance
@@ -30,7 +62,8 @@ app = FastAPI(
     title="Multi-Services API",
     description="An API to manage Multi-Services offerings and customer bookings",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_flight)]  # per-route in-flight gauge (see metrics.py)
 )
 
 # ─────────────────────────────────────────────
@@ -52,6 +85,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ─────────────────────────────────────────────
+# 🗜️ Gzip for large responses (e.g. GET /bookings pages, exports);
+# precompressed static files already carry Content-Encoding and pass through
+# ─────────────────────────────────────────────
+app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_BYTES, compresslevel=COMPRESS_LEVEL)
+
+# ─────────────────────────────────────────────
+# 📊 Per-route latency + DB query metrics (served at /admin/metrics)
+# ─────────────────────────────────────────────
+for db_engine in (engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine):
+    instrument_engine(db_engine)
+app.add_middleware(MetricsMiddleware)
+
+# ─────────────────────────────────────────────
+# ⏱️ First-request latency (logged once, see startup_timing.py)
+# ─────────────────────────────────────────────
+app.add_middleware(startup_timing.FirstRequestTimer)
+
+# ─────────────────────────────────────────────
+# 🪪 Request ID + access log (outermost, so it times the whole stack)
+# ─────────────────────────────────────────────
+app.add_middleware(RequestContextMiddleware)
+
 # ─────────────────────────────────────────────
 # 📦 Include Routers
 # ─────────────────────────────────────────────
@@ -59,3 +115,13 @@ app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(services.router)
 app.include_router(bookings.router)
+
+# ─────────────────────────────────────────────
+# 🖥️ Frontend — under its own prefix, so the API keeps every other path
+# ─────────────────────────────────────────────
+if os.path.isdir(FRONTEND_DIR):
+    app.mount(FRONTEND_PATH, PrecompressedStaticFiles(directory=FRONTEND_DIR, html=True), name="frontend")
+
+    @app.get("/", include_in_schema=False)
+    async def frontend_home():
+        return RedirectResponse(url=f"{FRONTEND_PATH}/")
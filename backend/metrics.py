@@ -0,0 +1,209 @@
+# ─────────────────────────────────────────────
+# 📊 metrics.py — Request & Database Instrumentation
+# ─────────────────────────────────────────────
+#
+# MetricsMiddleware times every HTTP request per route template,
+# `track_in_flight` counts requests being served, and SQLAlchemy cursor
+# events count the queries (and their time) issued while serving each one.
+# `render_prometheus()` turns everything into the Prometheus text
+# exposition format for GET /admin/metrics.
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)                             # queries per request
+
+# Route label for requests that match no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label tuple."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.series = defaultdict(lambda: {"counts": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0})
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self.series[labels]
+        series["counts"][bisect_left(self.buckets, value)] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+
+# ─────────────────────────────────────────────
+# 🗄️ Metric state (guarded by a single lock)
+# ─────────────────────────────────────────────
+_lock = threading.Lock()
+_requests_total: dict[tuple, int] = defaultdict(int)        # (method, route, status)
+_in_flight: dict[tuple, int] = defaultdict(int)             # (method, route)
+_request_latency = Histogram(LATENCY_BUCKETS)               # (method, route)
+_request_queries = Histogram(QUERY_COUNT_BUCKETS)           # (method, route)
+_request_query_time = Histogram(LATENCY_BUCKETS)            # (method, route)
+_db_totals = {"queries": 0, "seconds": 0.0}
+
+# Query counters of the request being served: {"queries": int, "seconds": float}
+_request_db_stats: ContextVar[dict | None] = ContextVar("request_db_stats", default=None)
+
+
+# ─────────────────────────────────────────────
+# 🔌 SQLAlchemy cursor hooks
+# ─────────────────────────────────────────────
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    with _lock:
+        _db_totals["queries"] += 1
+        _db_totals["seconds"] += elapsed
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["seconds"] += elapsed
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """
+    Count queries and their time on an engine.
+    For an AsyncEngine, pass its `.sync_engine`.
+    """
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ─────────────────────────────────────────────
+# ⏱️ Request timing middleware (pure ASGI)
+# ─────────────────────────────────────────────
+def _route_template(scope) -> str:
+    """Route path template (e.g. "/bookings/{id}") chosen by the router, once routed."""
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+async def track_in_flight(request: Request):
+    """
+    App-level dependency counting requests in flight per route.
+    It runs after routing, when the route template is known.
+    """
+    labels = (request.method, _route_template(request.scope))
+    with _lock:
+        _in_flight[labels] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _in_flight[labels] -= 1
+
+
+class MetricsMiddleware:
+    """Record latency, status and DB usage per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        db_stats = {"queries": 0, "seconds": 0.0}
+        token = _request_db_stats.set(db_stats)
+
+        async def send_and_capture_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_capture_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_db_stats.reset(token)
+            labels = (scope["method"], _route_template(scope))
+            with _lock:
+                _requests_total[labels + (str(status_code),)] += 1
+                _request_latency.observe(labels, elapsed)
+                _request_queries.observe(labels, db_stats["queries"])
+                _request_query_time.observe(labels, db_stats["seconds"])
+
+
+# ─────────────────────────────────────────────
+# 📄 Prometheus text exposition
+# ─────────────────────────────────────────────
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple, values: tuple) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _render_histogram(lines: list, name: str, help_text: str, histogram: Histogram, label_names: tuple) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, series in sorted(histogram.series.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), series["counts"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_label_str(label_names + ('le',), labels + (bound,))} {cumulative}")
+        lines.append(f"{name}_sum{_label_str(label_names, labels)} {series['sum']}")
+        lines.append(f"{name}_count{_label_str(label_names, labels)} {series['count']}")
+
+
+def render_prometheus(extra_gauges: dict[str, float] | None = None) -> str:
+    """
+    Render all collected metrics in the Prometheus text format.
+
+    Args:
+        extra_gauges (dict[str, float] | None): Additional name → value gauges
+            (e.g. cache counters) to append as-is.
+
+    Returns:
+        str: The exposition text.
+    """
+    route_labels = ("method", "route")
+    lines = []
+    with _lock:
+        lines.append("# HELP http_requests_total HTTP requests served, by route and status")
+        lines.append("# TYPE http_requests_total counter")
+        for labels, value in sorted(_requests_total.items()):
+            lines.append(f"http_requests_total{_label_str(route_labels + ('status',), labels)} {value}")
+
+        lines.append("# HELP http_requests_in_flight HTTP requests currently being served")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        for labels, value in sorted(_in_flight.items()):
+            lines.append(f"http_requests_in_flight{_label_str(route_labels, labels)} {value}")
+
+        _render_histogram(lines, "http_request_duration_seconds",
+                          "HTTP request latency", _request_latency, route_labels)
+        _render_histogram(lines, "http_request_db_queries",
+                          "Database queries issued per HTTP request", _request_queries, route_labels)
+        _render_histogram(lines, "http_request_db_seconds",
+                          "Time spent in database queries per HTTP request", _request_query_time, route_labels)
+
+        lines.append("# HELP db_queries_total Database queries executed")
+        lines.append("# TYPE db_queries_total counter")
+        lines.append(f"db_queries_total {_db_totals['queries']}")
+        lines.append("# HELP db_query_seconds_total Time spent executing database queries")
+        lines.append("# TYPE db_query_seconds_total counter")
+        lines.append(f"db_query_seconds_total {_db_totals['seconds']}")
+
+    for name, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
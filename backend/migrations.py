@@ -0,0 +1,338 @@
+# ─────────────────────────────────────────────
+# 🧬 migrations.py — Versioned Schema Migrations
+# ─────────────────────────────────────────────
+#
+# `init_db` creates missing tables with `create_tables` (`create_all`, which
+# never touches existing tables). Everything that must also reach databases created by an
+# older release (indexes, new columns, triggers...) goes here as a numbered
+# migration.
+#
+# Rules for adding a migration:
+#   • append it with the next version number — never edit or reorder old ones
+#   • every step must be idempotent (IF NOT EXISTS, etc.): several workers may
+#     start at once and race to apply the same version
+#   • a step is either a SQL string or a callable taking the Connection
+
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import Date, DateTime, MetaData, bindparam, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError, SQLAlchemyError
+
+from logger import logger
+
+
+def _rebuild_booking_stats(conn: Connection) -> None:
+    # Imported lazily: crud modules import models, which must not load during DB setup
+    from crud.stats import rebuild_booking_stats
+    rebuild_booking_stats(conn)
+
+
+def _sqlite_only(*statements: str):
+    """Step running `statements` on SQLite and doing nothing on other databases."""
+    def step(conn: Connection) -> None:
+        if conn.dialect.name != "sqlite":
+            logger.info("🧬 Skipping SQLite-only migration step")
+            return
+        for statement in statements:
+            conn.execute(text(statement))
+    return step
+
+
+def _sqlite_write_lock(conn: Connection) -> None:
+    """
+    Take SQLite's write lock before a step looks at the schema: another
+    worker may be applying the same step, and a deferred transaction that
+    read first could not upgrade to a writer afterwards.
+    """
+    if not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# Keep the FTS index in step with booking writes
+_BOOKING_FTS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS booking_fts_ai AFTER INSERT ON booking BEGIN"
+    " INSERT INTO booking_fts (rowid, name, email, phone, message)"
+    " VALUES (new.id, new.name, new.email, new.phone, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_fts_ad AFTER DELETE ON booking BEGIN"
+    " INSERT INTO booking_fts (booking_fts, rowid, name, email, phone, message)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_fts_au AFTER UPDATE OF name, email, phone, message ON booking BEGIN"
+    " INSERT INTO booking_fts (booking_fts, rowid, name, email, phone, message)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone, old.message);"
+    " INSERT INTO booking_fts (rowid, name, email, phone, message)"
+    " VALUES (new.id, new.name, new.email, new.phone, new.message); END",
+]
+
+# Full-text index over the booking contact fields (external content: the
+# text lives in `booking`, the FTS table only stores the index)
+_BOOKING_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS booking_fts USING fts5("
+    " name, email, phone, message,"
+    " content='booking', content_rowid='id',"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    *_BOOKING_FTS_TRIGGERS,
+    # Backfill: reindex every existing booking
+    "INSERT INTO booking_fts (booking_fts) VALUES ('rebuild')",
+]
+
+
+# booking as of migration 5. Table rebuilds spell the schema out instead of
+# reading the model, which keeps changing after the migration has shipped.
+_BOOKING_COLUMNS = "id, name, email, phone, service_id, message, appointment_time, status, created_at"
+
+_BOOKING_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_booking_email ON booking (email)",
+    "CREATE INDEX IF NOT EXISTS ix_booking_appointment_time_status ON booking (appointment_time, status)",
+    "CREATE INDEX IF NOT EXISTS ix_booking_service_id ON booking (service_id)",
+    "CREATE INDEX IF NOT EXISTS ix_booking_service_id_appointment_time ON booking (service_id, appointment_time)",
+]
+
+
+def _rebuild_booking_table(conn: Connection, ddl: str) -> None:
+    """
+    Rebuild `booking` on SQLite from `ddl`, which creates `booking_rebuild`:
+    copy every row (IDs included, so the FTS index and the rollup stay
+    valid), swap the tables, then recreate the indexes and FTS triggers.
+    """
+    conn.execute(text("DROP TABLE IF EXISTS booking_rebuild"))
+    conn.execute(text(ddl))
+    conn.execute(text(
+        f"INSERT INTO booking_rebuild ({_BOOKING_COLUMNS}) SELECT {_BOOKING_COLUMNS} FROM booking"
+    ))
+    conn.execute(text("DROP TABLE booking"))
+    conn.execute(text("ALTER TABLE booking_rebuild RENAME TO booking"))
+    for statement in [*_BOOKING_INDEXES, *_BOOKING_FTS_TRIGGERS]:
+        conn.execute(text(statement))
+
+
+def _delete_orphan_bookings(conn: Connection) -> None:
+    """
+    Delete bookings whose service no longer exists (they would violate the
+    enforced FK) and take them out of the booking_daily_stat rollup.
+    """
+    # Imported lazily: crud modules import models, which must not load during DB setup
+    from crud.stats import stat_day
+    orphans = conn.execute(text(
+        "SELECT appointment_time, service_id, status FROM booking"
+        " WHERE service_id NOT IN (SELECT id FROM service)"
+    ).columns(appointment_time=DateTime)).all()
+    if not orphans:
+        return
+    counts = Counter(
+        (stat_day(appointment_time), service_id, status)
+        for appointment_time, service_id, status in orphans
+    )
+    conn.execute(
+        text(
+            "UPDATE booking_daily_stat SET count = count - :n"
+            " WHERE day = :day AND service_id = :service_id AND status = :status"
+        ).bindparams(bindparam("day", type_=Date)),
+        [{"n": n, "day": day, "service_id": service_id, "status": status}
+         for (day, service_id, status), n in counts.items()],
+    )
+    conn.execute(text("DELETE FROM booking WHERE service_id NOT IN (SELECT id FROM service)"))
+    logger.warning(f"⚠️ Deleted {len(orphans)} bookings of already-deleted services during the FK rebuild")
+
+
+def _cascade_booking_service_fk(conn: Connection) -> None:
+    """
+    Give booking.service_id's foreign key ON DELETE CASCADE.
+
+    PostgreSQL swaps the constraint in place. SQLite cannot alter a
+    constraint, so the table is rebuilt (see `_rebuild_booking_table`).
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "ALTER TABLE booking DROP CONSTRAINT IF EXISTS booking_service_id_fkey,"
+            " ADD CONSTRAINT booking_service_id_fkey FOREIGN KEY (service_id)"
+            " REFERENCES service (id) ON DELETE CASCADE"
+        ))
+        return
+    if conn.dialect.name != "sqlite":
+        logger.info("🧬 Skipping booking FK rebuild on this database")
+        return
+
+    _sqlite_write_lock(conn)
+    foreign_keys = conn.execute(text("PRAGMA foreign_key_list(booking)")).mappings().all()
+    if any(fk["table"] == "service" and fk["on_delete"] == "CASCADE" for fk in foreign_keys):
+        return
+
+    _delete_orphan_bookings(conn)
+    _rebuild_booking_table(conn, (
+        "CREATE TABLE booking_rebuild ("
+        " id INTEGER NOT NULL,"
+        " name VARCHAR NOT NULL,"
+        " email VARCHAR NOT NULL,"
+        " phone VARCHAR,"
+        " service_id INTEGER NOT NULL,"
+        " message VARCHAR,"
+        " appointment_time DATETIME NOT NULL,"
+        " status VARCHAR NOT NULL,"
+        " created_at DATETIME NOT NULL,"
+        " PRIMARY KEY (id),"
+        " FOREIGN KEY (service_id) REFERENCES service (id) ON DELETE CASCADE)"
+    ))
+
+
+def _drop_booking_daily_stat_revenue(conn: Connection) -> None:
+    """Drop booking_daily_stat.revenue: revenue is now priced when read."""
+    if conn.dialect.name != "sqlite":
+        conn.execute(text("ALTER TABLE booking_daily_stat DROP COLUMN IF EXISTS revenue"))
+        return
+    _sqlite_write_lock(conn)
+    columns = conn.execute(text("PRAGMA table_info(booking_daily_stat)")).mappings().all()
+    if any(column["name"] == "revenue" for column in columns):
+        conn.execute(text("ALTER TABLE booking_daily_stat DROP COLUMN revenue"))
+
+
+def _booking_id_autoincrement(conn: Connection) -> None:
+    """
+    Make booking.id AUTOINCREMENT on SQLite (a table rebuild), so an ID is
+    never handed out again once its row is gone, e.g. moved to
+    booking_archive. The sequence starts above every ID used so far,
+    archived ones included. Other databases never reuse sequence values.
+    """
+    if conn.dialect.name != "sqlite":
+        logger.info("🧬 Skipping booking AUTOINCREMENT rebuild on this database")
+        return
+
+    _sqlite_write_lock(conn)
+    ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'booking'")).scalar()
+    if "AUTOINCREMENT" not in ddl.upper():
+        _rebuild_booking_table(conn, (
+            "CREATE TABLE booking_rebuild ("
+            " id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,"
+            " name VARCHAR NOT NULL,"
+            " email VARCHAR NOT NULL,"
+            " phone VARCHAR,"
+            " service_id INTEGER NOT NULL,"
+            " message VARCHAR,"
+            " appointment_time DATETIME NOT NULL,"
+            " status VARCHAR NOT NULL,"
+            " created_at DATETIME NOT NULL,"
+            " FOREIGN KEY (service_id) REFERENCES service (id) ON DELETE CASCADE)"
+        ))
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'booking'"))
+    conn.execute(text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'booking', max("
+        " COALESCE((SELECT max(id) FROM booking), 0),"
+        " COALESCE((SELECT max(id) FROM booking_archive), 0))"
+    ))
+
+
+# (version, name, steps)
+MIGRATIONS = [
+    (1, "booking and service lookup indexes", [
+        "CREATE INDEX IF NOT EXISTS ix_booking_service_id ON booking (service_id)",
+        "CREATE INDEX IF NOT EXISTS ix_booking_appointment_time_status ON booking (appointment_time, status)",
+        "CREATE INDEX IF NOT EXISTS ix_booking_email ON booking (email)",
+        "CREATE INDEX IF NOT EXISTS ix_service_active ON service (active)",
+    ]),
+    (2, "booking slot-conflict index", [
+        "CREATE INDEX IF NOT EXISTS ix_booking_service_id_appointment_time ON booking (service_id, appointment_time)",
+    ]),
+    (3, "backfill booking_daily_stat rollup", [
+        _rebuild_booking_stats,
+    ]),
+    (4, "booking full-text search index", [
+        _sqlite_only(*_BOOKING_FTS),
+    ]),
+    (5, "booking.service_id ON DELETE CASCADE", [
+        _cascade_booking_service_fk,
+    ]),
+    (6, "drop booking_daily_stat.revenue", [
+        _drop_booking_daily_stat_revenue,
+    ]),
+    (7, "booking.id AUTOINCREMENT", [
+        _booking_id_autoincrement,
+    ]),
+]
+
+
+def create_tables(engine: Engine, metadata: MetaData) -> None:
+    """
+    Create the tables of `metadata` that do not exist yet.
+
+    `create_all` checks, then creates, so workers starting together on an
+    older database race to create the same new tables. On SQLite the write
+    lock is taken first: the other workers wait, then find the tables. On
+    other databases a worker that loses the race re-checks once, which
+    skips whatever the winner created.
+
+    Args:
+        engine (Engine): Engine of the database.
+        metadata (MetaData): Tables to create.
+    """
+    try:
+        with engine.begin() as conn:
+            if conn.dialect.name == "sqlite":
+                _sqlite_write_lock(conn)
+            metadata.create_all(conn)
+    except (IntegrityError, OperationalError, ProgrammingError) as e:
+        logger.info(f"🧬 Tables were being created by another worker, re-checking ({e.orig})")
+        metadata.create_all(engine)
+
+
+def _ensure_version_table(engine: Engine) -> None:
+    """Create the bookkeeping table that records applied versions."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR NOT NULL,"
+            " applied_at VARCHAR NOT NULL)"
+        ))
+
+
+def _applied_versions(engine: Engine) -> set[int]:
+    with engine.connect() as conn:
+        return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _apply(conn: Connection, steps) -> None:
+    for step in steps:
+        if callable(step):
+            step(conn)
+        else:
+            conn.execute(text(step))
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Apply every pending migration, in version order.
+
+    Each migration runs in its own transaction together with the row that
+    records it. If another worker records the same version first, the
+    duplicate insert fails and this worker simply moves on.
+
+    Args:
+        engine (Engine): Engine of the database to migrate.
+
+    Returns:
+        int: Number of migrations applied by this call.
+    """
+    _ensure_version_table(engine)
+    applied = _applied_versions(engine)
+    count = 0
+
+    for version, name, steps in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as conn:
+                _apply(conn, steps)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                    {"v": version, "n": name, "t": datetime.now(timezone.utc).isoformat()},
+                )
+            count += 1
+            logger.info(f"🧬 Applied migration {version}: {name}")
+        except IntegrityError:
+            logger.info(f"🧬 Migration {version} already applied by another worker")
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Migration {version} ({name}) failed: {e}")
+            raise
+
+    return count
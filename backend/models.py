@@ -1,6 +1,8 @@
+from pydantic import field_validator
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
-from datetime import datetime, timezone
+from typing import Literal, Optional, List
+from datetime import date, datetime, timezone
 
 
 # ─────────────────────────────────────────────
@@ -28,13 +30,17 @@ class Service(SQLModel, table=True):
     )
     active: bool = Field(
         default=True,
+        index=True,
         description="Indicates whether the service is available for booking"
     )
 
-    # Back-reference to all bookings that reference this service
+    # Back-reference to all bookings that reference this service.
+    # Deleting a service leaves its bookings to the database's ON DELETE
+    # CASCADE (passive_deletes) instead of loading and deleting them one by one.
     bookings: List["Booking"] = Relationship(
         back_populates="service",
-        sa_relationship_kwargs={"cascade": "delete"}  # optional for cleanup
+        passive_deletes=True,
+        sa_relationship_kwargs={"cascade": "delete"}
     )
 
 
@@ -42,6 +48,15 @@ class Service(SQLModel, table=True):
 # 📅 Booking model — represents a single booking request by a client
 # ─────────────────────────────────────────────
 class Booking(SQLModel, table=True):
+    # Keep in sync with migrations.py so fresh and migrated databases match
+    __table_args__ = (
+        Index("ix_booking_appointment_time_status", "appointment_time", "status"),
+        Index("ix_booking_service_id_appointment_time", "service_id", "appointment_time"),
+        # SQLite would otherwise reuse the ID of a deleted newest row, which
+        # may already sit in booking_archive
+        {"sqlite_autoincrement": True},
+    )
+
     id: Optional[int] = Field(
         default=None,
         primary_key=True,
@@ -51,6 +66,7 @@ class Booking(SQLModel, table=True):
         description="Client's full name"
     )
     email: str = Field(
+        index=True,
         description="Client's email address"
     )
     phone: Optional[str] = Field(
@@ -60,6 +76,8 @@ class Booking(SQLModel, table=True):
 
     service_id: int = Field(
         foreign_key="service.id",
+        ondelete="CASCADE",
+        index=True,
         description="ID of the selected service (foreign key to Service)"
     )
     service: Optional[Service] = Relationship(
@@ -82,3 +100,238 @@ class Booking(SQLModel, table=True):
         default_factory=lambda: datetime.now(timezone.utc),
         description="Timestamp when the booking was created (UTC)"
     )
+
+
+# ─────────────────────────────────────────────
+# 🧊 BookingArchive — finished bookings moved out of the hot table
+# ─────────────────────────────────────────────
+class BookingArchive(SQLModel, table=True):
+    # Same columns as Booking (IDs are kept), without the foreign key
+    __tablename__ = "booking_archive"
+    __table_args__ = (
+        Index("ix_booking_archive_appointment_time_id", "appointment_time", "id"),
+    )
+
+    id: int = Field(primary_key=True, description="Original booking ID")
+    name: str = Field(description="Client's full name")
+    email: str = Field(index=True, description="Client's email address")
+    phone: Optional[str] = Field(default=None, description="Client phone number")
+    service_id: int = Field(description="ID of the booked service")
+    message: Optional[str] = Field(default=None, description="Extra message from the client")
+    appointment_time: datetime = Field(description="Appointment date and time")
+    status: str = Field(description="Final booking status (done or cancelled)")
+    created_at: datetime = Field(description="Timestamp when the booking was created (UTC)")
+    archived_at: datetime = Field(description="Timestamp when the booking was archived (UTC)")
+
+
+# ─────────────────────────────────────────────
+# 🔄 CacheGeneration — per-namespace write counter shared by all workers
+# ─────────────────────────────────────────────
+class CacheGeneration(SQLModel, table=True):
+    __tablename__ = "cache_generation"
+
+    namespace: str = Field(primary_key=True, description="Cache namespace (e.g. 'services')")
+    version: int = Field(default=0, description="Bumped by every write that affects the namespace")
+
+
+# ─────────────────────────────────────────────
+# 📊 BookingDailyStat — rollup of bookings per day, service and status
+# ─────────────────────────────────────────────
+class BookingDailyStat(SQLModel, table=True):
+    __tablename__ = "booking_daily_stat"
+
+    day: date = Field(
+        primary_key=True,
+        description="Appointment date (in the business timezone)"
+    )
+    service_id: int = Field(
+        primary_key=True,
+        description="ID of the booked service"
+    )
+    status: str = Field(
+        primary_key=True,
+        description="Booking status"
+    )
+    count: int = Field(
+        default=0,
+        description="Number of bookings in this group"
+    )
+
+
+# ─────────────────────────────────────────────
+# 🔑 IdempotencyRecord — stored response of a request sent with an Idempotency-Key
+# ─────────────────────────────────────────────
+class IdempotencyRecord(SQLModel, table=True):
+    __tablename__ = "idempotency_key"
+
+    key: str = Field(
+        primary_key=True,
+        description="Scoped client key, e.g. 'bookings:<Idempotency-Key header>'"
+    )
+    fingerprint: str = Field(
+        description="SHA-256 of the request payload the key was first used with"
+    )
+    status_code: int = Field(
+        description="HTTP status of the original response"
+    )
+    body: str = Field(
+        description="JSON body of the original response"
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        index=True,
+        description="When the key was first used (UTC); records expire after a TTL"
+    )
+
+
+# ─────────────────────────────────────────────
+# 📤 Read schemas — response shapes, decoupled from the table models
+# ─────────────────────────────────────────────
+class ServiceRead(SQLModel):
+    id: int
+    name: str
+    description: str
+    price: Optional[float] = None
+    duration_min: Optional[int] = None
+    active: bool
+
+
+class BookingRead(SQLModel):
+    id: int
+    name: str
+    email: str
+    phone: Optional[str] = None
+    service_id: int
+    message: Optional[str] = None
+    appointment_time: datetime
+    status: str
+    created_at: datetime
+
+
+# ─────────────────────────────────────────────
+# 📑 BookingPage — one keyset-paginated slice of bookings
+# ─────────────────────────────────────────────
+class BookingPage(SQLModel):
+    items: List[BookingRead] = Field(
+        description="Bookings on this page, ordered by appointment time then ID"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page, or null when this is the last page"
+    )
+
+
+# ─────────────────────────────────────────────
+# 🔎 BookingSearchPage — one page of ranked full-text search results
+# ─────────────────────────────────────────────
+class BookingSearchPage(SQLModel):
+    items: List[BookingRead] = Field(
+        description="Matching bookings, most relevant first"
+    )
+    next_offset: Optional[int] = Field(
+        default=None,
+        description="Offset of the next page, or null when this is the last page"
+    )
+
+
+# ─────────────────────────────────────────────
+# 🕒 TimeSlot — one free slot returned by the availability endpoint
+# ─────────────────────────────────────────────
+class TimeSlot(SQLModel):
+    start: datetime = Field(description="Slot start time (UTC)")
+    end: datetime = Field(description="Slot end time (UTC)")
+
+
+# ─────────────────────────────────────────────
+# 📝 Create schemas — validated input for new rows (and full PUT updates)
+# ─────────────────────────────────────────────
+class ServiceCreate(SQLModel):
+    name: str = Field(description="The display name of the service")
+    description: str = Field(description="Short explanation of what the service includes")
+    price: Optional[float] = Field(default=None, description="Optional price estimate in dollars")
+    duration_min: Optional[int] = Field(default=None, description="Optional duration of one booking, in minutes")
+    active: bool = Field(default=True, description="Whether the service is available for booking")
+
+
+class BookingCreate(SQLModel):
+    name: str = Field(description="Client's full name")
+    email: str = Field(description="Client's email address")
+    phone: Optional[str] = Field(default=None, description="Optional client phone number")
+    service_id: int = Field(description="ID of the selected service")
+    message: Optional[str] = Field(default=None, description="Optional extra message from the client")
+    appointment_time: datetime = Field(description="The date and time the client wants to book the service")
+
+
+# ─────────────────────────────────────────────
+# 🩹 Sparse updates — PATCH bodies; only the fields sent are written
+# ─────────────────────────────────────────────
+class BookingUpdate(SQLModel):
+    name: Optional[str] = Field(default=None, description="Client's full name")
+    email: Optional[str] = Field(default=None, description="Client's email address")
+    phone: Optional[str] = Field(default=None, description="Client phone number")
+    service_id: Optional[int] = Field(default=None, description="ID of the selected service")
+    message: Optional[str] = Field(default=None, description="Extra message from the client")
+    appointment_time: Optional[datetime] = Field(default=None, description="New appointment date and time")
+
+    @field_validator("name", "email", "service_id", "appointment_time")
+    @classmethod
+    def _not_null(cls, value):
+        # Omitting these is fine; explicitly clearing a NOT NULL column is not
+        if value is None:
+            raise ValueError("may be omitted but not set to null")
+        return value
+
+
+class ServiceUpdate(SQLModel):
+    name: Optional[str] = Field(default=None, description="Display name of the service")
+    description: Optional[str] = Field(default=None, description="What the service includes")
+    price: Optional[float] = Field(default=None, description="Price estimate in dollars")
+    duration_min: Optional[int] = Field(default=None, description="Duration of one booking, in minutes")
+    active: Optional[bool] = Field(default=None, description="Whether the service is available for booking")
+
+    @field_validator("name", "description", "active")
+    @classmethod
+    def _not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not set to null")
+        return value
+
+
+# ─────────────────────────────────────────────
+# 📦 Batch ingestion results — one entry per submitted booking
+# ─────────────────────────────────────────────
+class BookingBatchItem(SQLModel):
+    index: int = Field(description="Position of the booking in the submitted list")
+    id: Optional[int] = Field(default=None, description="ID of the created booking, if accepted")
+    error: Optional[str] = Field(default=None, description="Why the booking was rejected, if it was")
+
+
+class BookingBatchResult(SQLModel):
+    created: int = Field(description="Number of bookings inserted")
+    failed: int = Field(description="Number of bookings rejected")
+    results: List[BookingBatchItem] = Field(description="Per-booking outcome, in submission order")
+
+
+# ─────────────────────────────────────────────
+# 🔁 Bulk status change — move many bookings to one status
+# ─────────────────────────────────────────────
+class BookingStatusChange(SQLModel):
+    ids: List[int] = Field(description="IDs of the bookings to move")
+    status: Literal["confirmed", "done", "cancelled"] = Field(
+        description="Target status (pending→confirmed→done; anything but cancelled→cancelled)"
+    )
+
+
+class BookingStatusResult(SQLModel):
+    status: str = Field(description="Target status")
+    updated: List[int] = Field(description="IDs that moved to the target status")
+    skipped: List[int] = Field(description="IDs not found, or whose status does not allow the transition")
+
+
+# ─────────────────────────────────────────────
+# 🧊 Archival run summary
+# ─────────────────────────────────────────────
+class ArchiveResult(SQLModel):
+    archived: int = Field(description="Bookings moved to booking_archive")
+    batches: int = Field(description="Transactions used")
+    cutoff: datetime = Field(description="Bookings with an appointment before this time were eligible")
@@ -0,0 +1,209 @@
+# ─────────────────────────────────────────────
+# 🚦 ratelimit.py — Admission Control for Public Writes
+# ─────────────────────────────────────────────
+#
+# Two layers guard the unauthenticated write routes (POST /bookings):
+#   • token buckets per client IP and per email reject floods with 429
+#     before any database work;
+#   • a concurrency limiter lets at most PUBLIC_WRITE_CONCURRENCY public
+#     writes reach the database at once. A few more may queue briefly;
+#     anything beyond that gets an immediate 503.
+# Both answers carry Retry-After. Admin routes are never limited here, so
+# the SQLite writer stays available to them during a spam burst.
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+from group_commit import BOOKING_GROUP_COMMIT, GROUP_COMMIT_MAX_ROWS
+from logger import logger
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+RATE_LIMIT_ENABLED            = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+BOOKING_RATE_PER_IP           = float(os.getenv("BOOKING_RATE_PER_IP", 10))     # per minute
+BOOKING_BURST_PER_IP          = int(os.getenv("BOOKING_BURST_PER_IP", 5))
+BOOKING_RATE_PER_EMAIL        = float(os.getenv("BOOKING_RATE_PER_EMAIL", 2))   # per minute
+BOOKING_BURST_PER_EMAIL       = int(os.getenv("BOOKING_BURST_PER_EMAIL", 3))
+RATE_LIMIT_MAX_KEYS           = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))
+# With group commit, handlers only wait on the shared writer: admit a full
+# group at once, or groups could never grow past this limit
+PUBLIC_WRITE_CONCURRENCY      = int(os.getenv("PUBLIC_WRITE_CONCURRENCY", GROUP_COMMIT_MAX_ROWS if BOOKING_GROUP_COMMIT else 4))
+PUBLIC_WRITE_QUEUE_SIZE       = int(os.getenv("PUBLIC_WRITE_QUEUE_SIZE", 16))
+PUBLIC_WRITE_QUEUE_TIMEOUT_MS = int(os.getenv("PUBLIC_WRITE_QUEUE_TIMEOUT_MS", 1000))
+# Only enable behind a proxy that overwrites X-Forwarded-For
+TRUST_FORWARDED_FOR           = os.getenv("TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes")
+
+_stats_lock = threading.Lock()
+_stats = {"rate_limited_ip": 0, "rate_limited_email": 0, "write_queue_rejected": 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+# ─────────────────────────────────────────────
+# 🪣 Token buckets — key → (tokens, last refill), LRU-bounded
+# ─────────────────────────────────────────────
+class TokenBuckets:
+    """
+    One token bucket per key: `burst` tokens, refilled at `rate_per_min`.
+
+    Keys that have not been seen for a while are evicted first once
+    `max_keys` is reached (an evicted key simply starts again full).
+    """
+
+    def __init__(self, rate_per_min: float, burst: int, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = rate_per_min / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> float:
+        """Take one token; return 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# ─────────────────────────────────────────────
+# 🚧 Concurrency limiter — bounded semaphore with a short, bounded queue
+# ─────────────────────────────────────────────
+class WriteQueueFull(Exception):
+    """Raised when a request cannot get a write slot in time."""
+
+
+class ConcurrencyLimiter:
+    """Let `limit` requests in at once; up to `queue_size` more wait `timeout` seconds."""
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self.waiting >= self.queue_size:
+            raise WriteQueueFull()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise WriteQueueFull()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+ip_buckets = TokenBuckets(BOOKING_RATE_PER_IP, BOOKING_BURST_PER_IP)
+email_buckets = TokenBuckets(BOOKING_RATE_PER_EMAIL, BOOKING_BURST_PER_EMAIL)
+public_writes = ConcurrencyLimiter(
+    PUBLIC_WRITE_CONCURRENCY, PUBLIC_WRITE_QUEUE_SIZE, PUBLIC_WRITE_QUEUE_TIMEOUT_MS / 1000
+)
+
+
+def client_ip(request: Request) -> str:
+    """Best guess of the caller's IP (first X-Forwarded-For hop only if trusted)."""
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many requests, please retry later",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+def check_email_rate(email: str) -> None:
+    """
+    Charge one booking to an email address.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the address is over its rate.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    wait = email_buckets.take(email.strip().lower())
+    if wait:
+        _count("rate_limited_email")
+        logger.warning(f"🚦 Booking rate limit hit for an email ({wait:.1f}s)")
+        raise _too_many(wait)
+
+
+async def guard_public_write(request: Request):
+    """
+    Dependency for public write routes: per-IP rate limit, then a write slot.
+
+    Raises:
+        429 Too Many Requests — if the client IP is over its rate
+        503 Service Unavailable — if no write slot frees up in time
+    """
+    if not RATE_LIMIT_ENABLED:
+        yield
+        return
+
+    ip = client_ip(request)
+    wait = ip_buckets.take(ip)
+    if wait:
+        _count("rate_limited_ip")
+        logger.warning(f"🚦 Booking rate limit hit for {ip} ({wait:.1f}s)")
+        raise _too_many(wait)
+
+    try:
+        async with public_writes.slot():
+            yield
+    except WriteQueueFull:
+        _count("write_queue_rejected")
+        logger.warning("🚦 Public write queue full, shedding request")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": str(max(1, math.ceil(public_writes.timeout)))},
+        )
+
+
+def get_admission_stats() -> dict:
+    """Snapshot of the rejection counters and current limiter state."""
+    with _stats_lock:
+        stats = dict(_stats)
+    return {
+        **stats,
+        "write_in_flight": public_writes.in_flight,
+        "write_waiting": public_writes.waiting,
+        "tracked_ips": len(ip_buckets),
+        "tracked_emails": len(email_buckets),
+    }
@@ -0,0 +1,38 @@
+# ─────────────────────────────────────────────
+# ⚡ responses.py — Fast JSON Rendering
+# ─────────────────────────────────────────────
+#
+# Routes with a `response_model` are already serialized to bytes by Pydantic.
+# Hot list endpoints go further: they select plain columns, build dicts from
+# the row tuples and return a `FastJSONResponse` directly, so no ORM objects
+# are created and no per-field response validation runs.
+
+import os
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# ─────────────────────────────────────────────
+# 🗜️ Response compression (GZipMiddleware, see main.py)
+# ─────────────────────────────────────────────
+# Smaller bodies are sent as-is: compressing them costs more than it saves
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+# zlib level 1-9; above ~5 output barely shrinks while CPU time keeps growing
+COMPRESS_LEVEL     = int(os.getenv("COMPRESS_LEVEL", 5))
+
+# OPT_UTC_Z writes a UTC offset as "Z" instead of "+00:00". OPT_NAIVE_UTC
+# serializes naive datetimes (what SQLite hands back) as UTC, which is how
+# they are stored. OPT_NON_STR_KEYS allows e.g. int dict keys.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content) -> bytes:
+    """Serialize plain data (dicts, lists, datetimes...) to compact JSON bytes."""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
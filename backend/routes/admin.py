@@ -2,8 +2,20 @@
 # 🛠️ routes/admin.py — Admin Dashboard Landing
 # ─────────────────────────────────────────────
 
-from fastapi import APIRouter, Depends
-from auth import admin_required
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from auth import admin_required, get_token_cache_stats
+from cache_bus import cache_bus
+from crud.archive import archive_bookings_async
+from crud.stats import get_dashboard_stats_async
+from database import async_engine, get_async_read_session
+from models import ArchiveResult
+from metrics import render_prometheus
+from ratelimit import get_admission_stats
+from startup_timing import get_startup_stats
 from logger import logger
 
 router = APIRouter(
@@ -13,7 +25,7 @@ router = APIRouter(
 
 # 📄 GET /admin → Landing page (admin only)
 @router.get("/", dependencies=[Depends(admin_required)])
-def admin_home():
+async def admin_home():
     """
     Welcome page for authenticated admin.
 
@@ -21,3 +33,65 @@ def admin_home():
     """
     logger.info("📥 Admin accessed dashboard home.")
     return {"message": "Welcome to the Multi-Service admin dashboard!"}
+
+
+# 📊 GET /admin/metrics → Prometheus metrics (admin only)
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(admin_required)])
+async def admin_metrics():
+    """
+    Per-route latency histograms, in-flight counts, DB queries per request,
+    cache and admission-control counters and startup timings, in the
+    Prometheus text format.
+
+    Protected by JWT token.
+    """
+    gauges = {f"auth_token_cache_{name}": value for name, value in get_token_cache_stats().items()}
+    gauges.update({f"admission_{name}": value for name, value in get_admission_stats().items()})
+    gauges.update({f"cache_bus_{name}": value for name, value in cache_bus.get_stats().items()})
+    gauges.update({f"startup_{name}": value for name, value in get_startup_stats().items()})
+    body = render_prometheus(gauges)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+# 📈 GET /admin/stats → Booking dashboard figures (admin only)
+@router.get("/stats", dependencies=[Depends(admin_required)])
+async def admin_stats(
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    Booking counts and revenue (at current prices) by status, service and
+    day, read from the `booking_daily_stat` rollup. `from`/`to` are
+    inclusive appointment days.
+
+    Protected by JWT token.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    logger.info(f"📈 Admin fetched booking stats ({date_from} → {date_to})")
+    return await get_dashboard_stats_async(session, date_from, date_to)
+
+
+# 🧊 POST /admin/archive → Move old finished bookings to the archive (admin only)
+@router.post("/archive", response_model=ArchiveResult, dependencies=[Depends(admin_required)])
+async def admin_archive(
+    older_than_days: int | None = Query(None, ge=1),
+    max_batches: int | None = Query(None, ge=1),
+):
+    """
+    Move done/cancelled bookings whose appointment is older than
+    `older_than_days` (default ARCHIVE_AFTER_DAYS) to `booking_archive`,
+    in short batches. Safe to run repeatedly, e.g. from a nightly cron job.
+
+    Protected by JWT token.
+    """
+    logger.info("🧊 Admin started a booking archival run")
+    try:
+        archived, batches, cutoff = await archive_bookings_async(
+            async_engine, older_than_days=older_than_days, max_batches=max_batches
+        )
+    except Exception as e:
+        logger.error(f"❌ Booking archival failed: {e}")
+        raise HTTPException(status_code=500, detail="Could not archive bookings")
+    return ArchiveResult(archived=archived, batches=batches, cutoff=cutoff)
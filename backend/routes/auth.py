@@ -2,28 +2,26 @@
 # 🔐 routes/auth.py — Google OAuth2 Login Flow
 # ─────────────────────────────────────────────
 
+import asyncio
+import importlib
+import json
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Request, HTTPException, status
 from fastapi.responses import RedirectResponse
-from authlib.integrations.starlette_client import OAuth
-from dotenv import load_dotenv
 from jose import jwt
 
+from auth import forget_token
 from logger import logger
 
-# ─────────────────────────────────────────────
-# 🌍 Load environment variables (safe if reloaded)
-# ─────────────────────────────────────────────
-load_dotenv()
-
 # ─────────────────────────────────────────────
 # 📦 Define router
 # ─────────────────────────────────────────────
 router = APIRouter(tags=["Auth"])
 
 # ─────────────────────────────────────────────
-# 🔐 OAuth2 / JWT configuration
+# 🔐 OAuth2 / JWT configuration (.env is loaded by main.py)
 # ─────────────────────────────────────────────
 GOOGLE_CLIENT_ID     = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
@@ -31,22 +29,105 @@ ADMIN_EMAIL          = os.getenv("ADMIN_EMAIL")
 SECRET_KEY           = os.getenv("SECRET_KEY") or "supersecret"
 JWT_EXPIRY_HOURS     = int(os.getenv("JWT_EXPIRY_HOURS", 8))
 
-# 🔥 Validate critical credentials at startup
-if not all([GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, ADMIN_EMAIL]):
-    logger.critical("❌ Missing required Google OAuth environment variables.")
-    raise RuntimeError("Missing GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, or ADMIN_EMAIL.")
+# OpenID discovery document, cached on disk so new workers skip the round-trip
+GOOGLE_METADATA_URL       = "https://accounts.google.com/.well-known/openid-configuration"
+OAUTH_METADATA_CACHE_FILE = os.getenv("OAUTH_METADATA_CACHE_FILE", "google_openid_configuration.json")
+OAUTH_METADATA_TTL_HOURS  = float(os.getenv("OAUTH_METADATA_TTL_HOURS", 24))
+OAUTH_WARMUP              = os.getenv("OAUTH_WARMUP", "true").lower() in ("1", "true", "yes")
+
+OAUTH_CONFIGURED = all([GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, ADMIN_EMAIL])
+if not OAUTH_CONFIGURED:
+    # The API still serves everything else; only the login routes refuse
+    logger.critical("❌ Missing GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, or ADMIN_EMAIL: admin login is disabled.")
+
+# Authlib (~0.2 s to import) is only loaded once a login needs it
+_AUTHLIB_MODULE = "authlib.integrations.starlette_client"
 
 # ─────────────────────────────────────────────
-# 🧩 Configure OAuth2 (Google)
+# 🧩 OAuth2 client (Google), built on first use
 # ─────────────────────────────────────────────
-oauth = OAuth()
-oauth.register(
-    name="google",
-    client_id=GOOGLE_CLIENT_ID,
-    client_secret=GOOGLE_CLIENT_SECRET,
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-    client_kwargs={"scope": "openid email"},
-)
+_google = None
+_google_lock = asyncio.Lock()
+
+
+def _metadata_fresh(metadata: dict) -> bool:
+    return time.time() - metadata.get("_loaded_at", 0) < OAUTH_METADATA_TTL_HOURS * 3600
+
+
+def _read_cached_metadata() -> dict | None:
+    """The discovery document from the disk cache, or None if missing or expired."""
+    try:
+        with open(OAUTH_METADATA_CACHE_FILE) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return metadata if isinstance(metadata, dict) and _metadata_fresh(metadata) else None
+
+
+def _write_cached_metadata(metadata: dict) -> None:
+    # Write-then-rename, so concurrent workers never read a half-written file
+    tmp_path = f"{OAUTH_METADATA_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, OAUTH_METADATA_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not cache OAuth metadata to {OAUTH_METADATA_CACHE_FILE}: {e}")
+
+
+async def _google_client():
+    """
+    Return the Google OAuth client, building it on first use.
+
+    Discovery metadata comes from the disk cache when it is fresh;
+    otherwise it is fetched once and written back for the next worker.
+    """
+    global _google
+    if _google is not None and _metadata_fresh(_google.server_metadata):
+        return _google
+    if not OAUTH_CONFIGURED:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Admin login is not configured")
+
+    async with _google_lock:
+        if _google is None:
+            oauth = importlib.import_module(_AUTHLIB_MODULE).OAuth()
+            _google = oauth.register(
+                name="google",
+                client_id=GOOGLE_CLIENT_ID,
+                client_secret=GOOGLE_CLIENT_SECRET,
+                server_metadata_url=GOOGLE_METADATA_URL,
+                client_kwargs={"scope": "openid email"},
+            )
+        if not _metadata_fresh(_google.server_metadata):
+            cached = _read_cached_metadata()
+            if cached:
+                _google.server_metadata.update(cached)
+                logger.info("🔐 OAuth discovery metadata loaded from disk cache")
+            else:
+                _google.server_metadata.pop("_loaded_at", None)  # make Authlib fetch it again
+                try:
+                    metadata = await _google.load_server_metadata()
+                except Exception as e:
+                    logger.error(f"❌ Could not fetch OAuth discovery metadata: {e}")
+                    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Identity provider unavailable")
+                _write_cached_metadata(metadata)
+                logger.info("🔐 OAuth discovery metadata fetched and cached")
+    return _google
+
+
+async def warm_up_oauth() -> None:
+    """
+    Build the OAuth client in the background after startup, so the first
+    login pays neither the Authlib import nor the discovery round-trip.
+    """
+    if not (OAUTH_WARMUP and OAUTH_CONFIGURED):
+        return
+    try:
+        # Import in a thread: it must not stall the event loop
+        await asyncio.to_thread(importlib.import_module, _AUTHLIB_MODULE)
+        await _google_client()
+    except Exception as e:
+        logger.warning(f"⚠️ OAuth warm-up failed, the first login will retry: {e}")
 
 # 🔗 GET /auth/login → Redirect to Google login
 @router.get("/auth/login")
@@ -58,14 +139,17 @@ async def login(request: Request):
     """
     redirect_uri = request.url_for("auth_callback")
     logger.info(f"🔄 Initiating Google OAuth login (redirect_uri={redirect_uri})")
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    google = await _google_client()
+    return await google.authorize_redirect(request, redirect_uri)
 
 # 🚪 GET /auth/logout → Clears JWT cookie
 @router.get("/auth/logout")
-def logout():
+def logout(request: Request):
     """
-    Logs out the user by clearing the JWT cookie.
+    Logs out the user by clearing the JWT cookie
+    and dropping it from the verified-token cache.
     """
+    forget_token(request.cookies.get("access_token"))
     response = RedirectResponse(url="/")
     response.delete_cookie("access_token")
     logger.info("👋 Admin logged out.")
@@ -79,8 +163,9 @@ async def auth_callback(request: Request):
 
     Issues a JWT as an HttpOnly cookie if the user is authorized.
     """
+    google = await _google_client()
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await google.authorize_access_token(request)
         user_info = token.get("userinfo") or token.get("id_token_claims")
         email = user_info.get("email")
     except Exception as e:
@@ -109,7 +194,7 @@ async def auth_callback(request: Request):
     jwt_token = jwt.encode(jwt_payload, SECRET_KEY, algorithm="HS256")
 
     # 🍪 Store JWT in secure HttpOnly cookie
-    response = RedirectResponse(url="/admin")
+    response = RedirectResponse(url="/admin/")
     response.set_cookie(
         key="access_token",
         value=jwt_token,
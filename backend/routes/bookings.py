@@ -2,14 +2,30 @@
 # 📂 routes/bookings.py — Booking Endpoints
 # ─────────────────────────────────────────────
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from typing import List
+import csv
+import io
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Literal, Optional
 
-from models import Booking
-from database import get_session
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from models import (
+    Booking, BookingBatchItem, BookingBatchResult, BookingCreate, BookingPage, IdempotencyRecord,
+    BookingRead, BookingSearchPage, BookingStatusChange, BookingStatusResult, BookingUpdate,
+)
+from database import async_read_engine, get_async_read_session, get_async_session
 from auth import admin_required
+from ratelimit import check_email_rate, guard_public_write
+from group_commit import BOOKING_GROUP_COMMIT, booking_writer
 from crud import bookings as crud_bookings
+from crud import idempotency as crud_idempotency
+from crud import search as crud_search
+from crud.availability import SlotUnavailableError
+from responses import FastJSONResponse, dumps
 from logger import logger
 
 router = APIRouter(
@@ -18,31 +34,145 @@ router = APIRouter(
 )
 
 
-# 📄 GET /bookings → List all bookings (admin only)
-@router.get("/", response_model=List[Booking], dependencies=[Depends(admin_required)])
-def list_bookings(session: Session = Depends(get_session)):
+# 📄 GET /bookings → List bookings page by page (admin only)
+@router.get("/", response_model=BookingPage, dependencies=[Depends(admin_required)])
+async def list_bookings(
+    limit: int = Query(50, ge=1, le=crud_bookings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    service_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    email: Optional[str] = None,
+    sort: Literal["asc", "desc"] = "asc",
+    include_archived: bool = False,
+    session: AsyncSession = Depends(get_async_read_session),
+):
     """
-    Retrieve a list of all bookings.
+    Retrieve bookings one page at a time, ordered by appointment time.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    Optional filters: status, service_id, from/to (appointment time), email.
+    Archived bookings are left out unless `include_archived=true`.
 
     Requires admin token.
     """
     try:
-        logger.info("🔐 Admin requested full list of bookings.")
-        return crud_bookings.get_all_bookings(session)
+        logger.info("🔐 Admin requested a page of bookings.")
+        items, next_cursor = await crud_bookings.get_bookings_page_async(
+            session,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            service_id=service_id,
+            date_from=date_from,
+            date_to=date_to,
+            email=email,
+            descending=sort == "desc",
+            include_archived=include_archived,
+        )
+        # Items are plain column dicts: render them directly, skipping model validation
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+    except crud_bookings.InvalidCursorError as e:
+        logger.warning(f"⚠️ Rejected bookings page request: {e}")
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
     except Exception as e:
         logger.error(f"❌ Failed to list bookings: {e}")
         raise HTTPException(status_code=500, detail="Could not retrieve bookings")
 
 
+# 📤 GET /bookings/export → Stream every booking as NDJSON or CSV (admin only)
+@router.get("/export", dependencies=[Depends(admin_required)])
+async def export_bookings(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+):
+    """
+    Export bookings as a streamed download.
+
+    Rows are read from a server-side cursor and written out batch by batch,
+    so the first bytes go out immediately and memory use stays constant.
+
+    Requires admin token.
+    """
+    logger.info(f"🔐 Admin requested bookings export ({format}).")
+
+    async def generate():
+        # The export owns its session: it must stay open until the last row is sent
+        async with AsyncSession(async_read_engine) as session:
+            rows = crud_bookings.iter_booking_rows_async(
+                session, status=status, date_from=date_from, date_to=date_to
+            )
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(crud_bookings.EXPORT_COLUMNS)
+                count = 0
+                async for row in rows:
+                    writer.writerow(row.values())
+                    count += 1
+                    if count % 500 == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                yield buffer.getvalue()
+            else:
+                async for row in rows:
+                    yield dumps(row) + b"\n"
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"bookings.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# 🔎 GET /bookings/search → Full-text search over client details (admin only)
+@router.get("/search", response_model=BookingSearchPage, dependencies=[Depends(admin_required)])
+async def search_bookings(
+    q: str = Query(min_length=1, max_length=crud_search.MAX_QUERY_LENGTH),
+    limit: int = Query(20, ge=1, le=crud_bookings.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    Find bookings by client name, email, phone or message.
+
+    Every word must match the start of a word ("ali mart" finds "Alice
+    Martin"); results are ranked by relevance. Pass `next_offset` back as
+    `offset` for the next page.
+
+    Requires admin token.
+    """
+    try:
+        items, next_offset = await crud_search.search_bookings_async(session, q, limit=limit, offset=offset)
+    except Exception as e:
+        logger.error(f"❌ Booking search failed: {e}")
+        raise HTTPException(status_code=500, detail="Could not search bookings")
+    return FastJSONResponse({"items": items, "next_offset": next_offset})
+
+
 # 📄 GET /bookings/{id} → Get a booking by ID (admin only)
-@router.get("/{id}", response_model=Booking, dependencies=[Depends(admin_required)])
-def get_booking(id: int, session: Session = Depends(get_session)):
+@router.get("/{id}", response_model=BookingRead, dependencies=[Depends(admin_required)])
+async def get_booking(
+    id: int,
+    include_archived: bool = False,
+    session: AsyncSession = Depends(get_async_read_session),
+):
     """
     Retrieve a specific booking by ID.
 
+    With `include_archived=true`, bookings moved to the archive are found too.
+
     Requires admin token.
     """
-    booking = crud_bookings.get_booking_by_id(session, id)
+    booking = await crud_bookings.get_booking_by_id_async(session, id)
+    if not booking and include_archived:
+        booking = await crud_bookings.get_archived_booking_async(session, id)
     if not booking:
         logger.warning(f"⚠️ Booking ID {id} not found.")
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -50,62 +180,247 @@ def get_booking(id: int, session: Session = Depends(get_session)):
     return booking
 
 
+def _replay(record: IdempotencyRecord, request_fingerprint: str) -> Response:
+    """Send back the response stored for an idempotency key."""
+    if record.fingerprint != request_fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    logger.info(f"🔑 Replaying stored response ({record.key})")
+    return Response(
+        content=record.body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _check_booking_email_rate(booking: BookingCreate) -> None:
+    """Per-email rate limit, run before `guard_public_write` takes a write slot."""
+    check_email_rate(booking.email)
+
+
 # ➕ POST /bookings → Create a new booking (public)
-@router.post("/", response_model=Booking, status_code=status.HTTP_201_CREATED)
-def create_booking(booking: Booking, session: Session = Depends(get_session)):
+@router.post(
+    "/",
+    response_model=BookingRead,
+    status_code=status.HTTP_201_CREATED,
+    # In order: an email over its rate is turned away without holding a write slot
+    dependencies=[Depends(_check_booking_email_rate), Depends(guard_public_write)],
+)
+async def create_booking(
+    booking: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=crud_idempotency.MAX_KEY_LENGTH),
+    session: AsyncSession = Depends(get_async_session),
+):
     """
     Submit a new booking request.
 
-    Public route. No authentication required.
+    Send an `Idempotency-Key` header to make retries safe: a repeat of the
+    same request with the same key returns the original response instead
+    of creating another booking.
+
+    Public route. No authentication required, but rate limited per IP and
+    per email (429) and admission-controlled (503) — see ratelimit.py.
     """
+    if not idempotency_key:
+        return await _create_booking(session, booking)
+
+    key = f"bookings:{idempotency_key}"
+    request_fingerprint = crud_idempotency.fingerprint(booking.model_dump(mode="json"))
+    async with crud_idempotency.key_lock(key):
+        record = await crud_idempotency.get_record_async(session, key)
+        if record:
+            return _replay(record, request_fingerprint)
+        try:
+            return await _create_booking(session, booking, (key, request_fingerprint))
+        except HTTPException:
+            # Another worker may have committed the same key first
+            record = await crud_idempotency.get_record_async(session, key)
+            if record:
+                return _replay(record, request_fingerprint)
+            raise
+
+
+async def _create_booking(
+    session: AsyncSession,
+    booking: BookingCreate,
+    idempotency_key: tuple[str, str] | None = None,
+) -> Booking:
     try:
-        new_booking = crud_bookings.create_booking(session, booking)
+        if BOOKING_GROUP_COMMIT:
+            new_booking = await booking_writer.submit(Booking.model_validate(booking), idempotency_key)
+        else:
+            new_booking = await crud_bookings.create_booking_async(
+                session, Booking.model_validate(booking), idempotency_key
+            )
         logger.info(f"📬 New booking submitted (ID: {new_booking.id})")
         return new_booking
+    except SlotUnavailableError as e:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        await session.rollback()
+        logger.warning(f"⚠️ Rejected booking: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        # Only the idempotency key is unique: a concurrent request committed it first
+        await session.rollback()
+        logger.warning("⚠️ Booking lost an idempotency-key race")
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"❌ Failed to create booking: {e}")
         raise HTTPException(status_code=500, detail="Could not create booking")
 
 
+# 📦 POST /bookings/batch → Create many bookings in one transaction (admin only)
+@router.post("/batch", response_model=BookingBatchResult, dependencies=[Depends(admin_required)])
+async def create_bookings_batch(items: List[dict], session: AsyncSession = Depends(get_async_session)):
+    """
+    Submit a batch of bookings (e.g. from a partner).
+
+    Each item is validated and slot-checked on its own: invalid or conflicting
+    items are reported in `results` while the others are inserted together.
+
+    Requires admin token.
+    """
+    if len(items) > crud_bookings.MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch is limited to {crud_bookings.MAX_BATCH_SIZE} bookings")
+
+    results = [BookingBatchItem(index=i) for i in range(len(items))]
+    valid_indexes, bookings = [], []
+    for i, item in enumerate(items):
+        try:
+            data = BookingCreate.model_validate(item)
+        except ValidationError as e:
+            results[i].error = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            continue
+        valid_indexes.append(i)
+        bookings.append(Booking.model_validate(data))
+
+    try:
+        outcomes = await crud_bookings.create_bookings_batch_async(session, bookings) if bookings else []
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"❌ Failed to store booking batch: {e}")
+        raise HTTPException(status_code=500, detail="Could not create bookings")
+
+    for i, outcome in zip(valid_indexes, outcomes):
+        if isinstance(outcome, int):
+            results[i].id = outcome
+        else:
+            results[i].error = outcome
+
+    created = sum(1 for r in results if r.id is not None)
+    logger.info(f"📬 Booking batch processed ({created}/{len(items)} created)")
+    return BookingBatchResult(created=created, failed=len(items) - created, results=results)
+
+
+# 🔁 POST /bookings/status → Move many bookings to one status (admin only)
+@router.post("/status", response_model=BookingStatusResult, dependencies=[Depends(admin_required)])
+async def change_bookings_status(change: BookingStatusChange, session: AsyncSession = Depends(get_async_session)):
+    """
+    Confirm, complete or cancel many bookings in one round-trip.
+
+    Allowed transitions: pending→confirmed, confirmed→done, and any other
+    status→cancelled. IDs that are unknown or not eligible are reported
+    as skipped, not as errors.
+
+    Requires admin token.
+    """
+    ids = list(dict.fromkeys(change.ids))
+    if len(ids) > crud_bookings.MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch is limited to {crud_bookings.MAX_BATCH_SIZE} bookings")
+    try:
+        updated = await crud_bookings.set_bookings_status_async(session, ids, change.status)
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"❌ Failed to move bookings to {change.status}: {e}")
+        raise HTTPException(status_code=500, detail="Could not update booking status")
+
+    changed = set(updated)
+    return BookingStatusResult(
+        status=change.status,
+        updated=updated,
+        skipped=[i for i in ids if i not in changed],
+    )
+
+
 # ✏️ PUT /bookings/{id} → Update a booking (admin only)
-@router.put("/{id}", response_model=Booking, dependencies=[Depends(admin_required)])
-def update_booking(id: int, updated_booking: Booking, session: Session = Depends(get_session)):
+@router.put("/{id}", response_model=BookingRead, dependencies=[Depends(admin_required)])
+async def update_booking(id: int, updated_booking: BookingCreate, session: AsyncSession = Depends(get_async_session)):
     """
     Update an existing booking.
 
+    The slot is re-checked as for PATCH (409 if taken, 400 for an unknown
+    or deactivated service).
+
     Requires admin token.
     """
-    db_booking = crud_bookings.get_booking_by_id(session, id)
-    if not db_booking:
+    try:
+        updated = await crud_bookings.update_booking_async(session, id, updated_booking)
+    except SlotUnavailableError as e:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"❌ Failed to update booking ID {id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not update booking")
+    if updated is None:
         logger.warning(f"⚠️ Booking ID {id} not found for update.")
         raise HTTPException(status_code=404, detail="Booking not found")
+    logger.info(f"✏️ Booking ID {id} updated.")
+    return updated
+
+
+# 🩹 PATCH /bookings/{id} → Update only the fields sent (admin only)
+@router.patch("/{id}", response_model=BookingRead, dependencies=[Depends(admin_required)])
+async def patch_booking(id: int, changes: BookingUpdate, session: AsyncSession = Depends(get_async_session)):
+    """
+    Partially update a booking in a single UPDATE statement.
+
+    Moving it to another service or time re-checks the slot (409 if taken).
+
+    Requires admin token.
+    """
     try:
-        updated = crud_bookings.update_booking(session, db_booking, updated_booking)
-        logger.info(f"✏️ Booking ID {id} updated.")
-        return updated
+        updated = await crud_bookings.patch_booking_async(session, id, changes.model_dump(exclude_unset=True))
+    except SlotUnavailableError as e:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        session.rollback()
-        logger.error(f"❌ Failed to update booking ID {id}: {e}")
+        await session.rollback()
+        logger.error(f"❌ Failed to patch booking ID {id}: {e}")
         raise HTTPException(status_code=500, detail="Could not update booking")
+    if updated is None:
+        logger.warning(f"⚠️ Booking ID {id} not found for patch.")
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return updated
 
 
 # ❌ DELETE /bookings/{id} → Delete a booking (admin only)
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admin_required)])
-def delete_booking(id: int, session: Session = Depends(get_session)):
+async def delete_booking(id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Permanently delete a booking by ID.
 
     Requires admin token.
     """
-    booking = crud_bookings.get_booking_by_id(session, id)
+    booking = await crud_bookings.get_booking_by_id_async(session, id)
     if not booking:
         logger.warning(f"⚠️ Booking ID {id} not found for deletion.")
         raise HTTPException(status_code=404, detail="Booking not found")
     try:
-        crud_bookings.delete_booking(session, booking)
+        await crud_bookings.delete_booking_async(session, booking)
         logger.info(f"🗑️ Booking ID {id} deleted.")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"❌ Failed to delete booking ID {id}: {e}")
         raise HTTPException(status_code=500, detail="Could not delete booking")
@@ -2,14 +2,17 @@
 # 📂 routes/services.py — Service Endpoints
 # ─────────────────────────────────────────────
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from models import Service
-from database import get_session
+from models import Service, ServiceCreate, ServiceRead, ServiceUpdate, TimeSlot
+from database import get_async_read_session, get_async_session
 from auth import admin_required
+from responses import COMPRESS_MIN_BYTES
 from crud import services as crud_services
+from crud import availability as crud_availability
 from logger import logger
 
 router = APIRouter(
@@ -18,31 +21,56 @@ router = APIRouter(
 )
 
 
+# Browsers/CDNs may reuse the catalog briefly, then must revalidate with the ETag
+CATALOG_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
 # 📄 GET /services → List all available services (public)
-@router.get("/", response_model=List[Service])
-def list_services(session: Session = Depends(get_session)):
+@router.get("/", response_model=List[ServiceRead])
+async def list_services(
+    request: Request,
+    include_inactive: bool = False,
+    session: AsyncSession = Depends(get_async_read_session),
+):
     """
     Retrieve a list of all available services.
 
+    Deactivated services are left out unless `include_inactive=true`.
+    Served from the in-process catalog cache (gzipped ahead of time) with
+    a strong ETag; a matching If-None-Match gets an empty 304.
+
     Public route. No authentication required.
     """
     try:
         logger.info("📦 Public request to list all services")
-        return crud_services.get_all_services(session)
+        catalog = await crud_services.get_catalog_json_async(session, include_inactive)
     except Exception as e:
         logger.error(f"❌ Failed to list services: {e}")
         raise HTTPException(status_code=500, detail="Could not retrieve services")
 
+    # The copy gzipped when the cache was filled: no compression per request.
+    # Each encoding is its own representation, with its own ETag.
+    gzipped = len(catalog.body) >= COMPRESS_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", "")
+    etag = catalog.etag[:-1] + '-gzip"' if gzipped else catalog.etag
+    headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=catalog.gzipped, media_type="application/json", headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
+
 
 # 📄 GET /services/{id} → Get a specific service by ID (admin only)
-@router.get("/{id}", response_model=Service, dependencies=[Depends(admin_required)])
-def get_service(id: int, session: Session = Depends(get_session)):
+@router.get("/{id}", response_model=ServiceRead, dependencies=[Depends(admin_required)])
+async def get_service(id: int, session: AsyncSession = Depends(get_async_read_session)):
     """
     Retrieve a single service by its ID.
 
     Requires admin token.
     """
-    service = crud_services.get_service_by_id(session, id)
+    service = await crud_services.get_service_by_id_async(session, id)
     if not service:
         logger.warning(f"⚠️ Service ID {id} not found")
         raise HTTPException(status_code=404, detail="Service not found")
@@ -50,62 +78,132 @@ def get_service(id: int, session: Session = Depends(get_session)):
     return service
 
 
+# 🕒 GET /services/{id}/availability → Free slots for a service (public)
+@router.get("/{id}/availability", response_model=List[TimeSlot])
+async def get_availability(
+    id: int,
+    date_from: datetime = Query(alias="from"),
+    date_to: datetime = Query(alias="to"),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    List the bookable time slots of a service between `from` and `to`.
+
+    Slots follow business hours and skip pending/confirmed bookings.
+
+    Public route. No authentication required.
+    """
+    service = await crud_services.get_service_by_id_async(session, id)
+    if not service or not service.active:
+        logger.warning(f"⚠️ Service ID {id} not found for availability")
+        raise HTTPException(status_code=404, detail="Service not found")
+    try:
+        slots = await crud_availability.get_free_slots_async(session, service, date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"🕒 {len(slots)} free slots for service ID {id}")
+    return [TimeSlot(start=start, end=end) for start, end in slots]
+
+
 # ➕ POST /services → Create a new service (admin only)
-@router.post("/", response_model=Service, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_required)])
-def create_service(service: Service, session: Session = Depends(get_session)):
+@router.post("/", response_model=ServiceRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_required)])
+async def create_service(service: ServiceCreate, session: AsyncSession = Depends(get_async_session)):
     """
     Create and store a new service.
 
     Requires admin token.
     """
     try:
-        new_service = crud_services.create_service(session, service)
+        new_service = await crud_services.create_service_async(session, Service.model_validate(service))
         logger.info(f"✅ Created new service with ID {new_service.id}")
         return new_service
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"❌ Failed to create service: {e}")
         raise HTTPException(status_code=500, detail="Could not create service")
 
 
 # ✏️ PUT /services/{id} → Update a service (admin only)
-@router.put("/{id}", response_model=Service, dependencies=[Depends(admin_required)])
-def update_service(id: int, updated_service: Service, session: Session = Depends(get_session)):
+@router.put("/{id}", response_model=ServiceRead, dependencies=[Depends(admin_required)])
+async def update_service(id: int, updated_service: ServiceCreate, session: AsyncSession = Depends(get_async_session)):
     """
     Update an existing service.
 
     Requires admin token.
     """
-    db_service = crud_services.get_service_by_id(session, id)
+    db_service = await crud_services.get_service_by_id_async(session, id)
     if not db_service:
         logger.warning(f"⚠️ Service ID {id} not found for update")
         raise HTTPException(status_code=404, detail="Service not found")
     try:
-        updated = crud_services.update_service(session, db_service, updated_service)
+        updated = await crud_services.update_service_async(session, db_service, updated_service)
         logger.info(f"✏️ Updated service ID {id}")
         return updated
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"❌ Failed to update service ID {id}: {e}")
         raise HTTPException(status_code=500, detail="Could not update service")
 
 
+# 🩹 PATCH /services/{id} → Update only the fields sent (admin only)
+@router.patch("/{id}", response_model=ServiceRead, dependencies=[Depends(admin_required)])
+async def patch_service(id: int, changes: ServiceUpdate, session: AsyncSession = Depends(get_async_session)):
+    """
+    Partially update a service in a single UPDATE statement.
+
+    Requires admin token.
+    """
+    try:
+        updated = await crud_services.patch_service_async(session, id, changes.model_dump(exclude_unset=True))
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"❌ Failed to patch service ID {id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not update service")
+    if updated is None:
+        logger.warning(f"⚠️ Service ID {id} not found for patch")
+        raise HTTPException(status_code=404, detail="Service not found")
+    return updated
+
+
+# 🚫 POST /services/{id}/deactivate → Soft-delete a service (admin only)
+@router.post("/{id}/deactivate", response_model=ServiceRead, dependencies=[Depends(admin_required)])
+async def deactivate_service(id: int, session: AsyncSession = Depends(get_async_session)):
+    """
+    Hide a service from the catalog and stop accepting bookings for it,
+    keeping the service and its bookings. Undo with PATCH {"active": true}.
+
+    Requires admin token.
+    """
+    try:
+        service = await crud_services.deactivate_service_async(session, id)
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"❌ Failed to deactivate service ID {id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not deactivate service")
+    if service is None:
+        logger.warning(f"⚠️ Service ID {id} not found for deactivation")
+        raise HTTPException(status_code=404, detail="Service not found")
+    logger.info(f"🚫 Deactivated service ID {id}")
+    return service
+
+
 # ❌ DELETE /services/{id} → Delete a service (admin only)
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admin_required)])
-def delete_service(id: int, session: Session = Depends(get_session)):
+async def delete_service(id: int, session: AsyncSession = Depends(get_async_session)):
     """
-    Permanently delete a service by ID.
+    Permanently delete a service by ID, together with all its bookings.
+    To retire a service but keep its history, deactivate it instead.
 
     Requires admin token.
     """
-    service = crud_services.get_service_by_id(session, id)
+    service = await crud_services.get_service_by_id_async(session, id)
     if not service:
         logger.warning(f"⚠️ Service ID {id} not found for deletion")
         raise HTTPException(status_code=404, detail="Service not found")
     try:
-        crud_services.delete_service(session, service)
+        await crud_services.delete_service_async(session, service)
         logger.info(f"🗑️ Deleted service ID {id}")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"❌ Failed to delete service ID {id}: {e}")
         raise HTTPException(status_code=500, detail="Could not delete service")
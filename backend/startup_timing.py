@@ -0,0 +1,78 @@
+# ─────────────────────────────────────────────
+# ⏱️ startup_timing.py — Cold-Start Profiling
+# ─────────────────────────────────────────────
+#
+# Imported by main.py before anything heavy, so its clock starts with the
+# app. main.py wraps each startup phase (imports per router, init_db) in
+# `phase(...)`, and FirstRequestTimer times the first request served.
+# The report is logged once startup completes; the durations are also
+# exported as gauges in /admin/metrics.
+
+import threading
+import time
+from contextlib import contextmanager
+
+from logger import logger
+
+_started = time.perf_counter()
+_lock = threading.Lock()
+# phase name → seconds, in the order the phases ran
+_phases: dict[str, float] = {}
+_ready_at: float | None = None
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block of startup work under `name` (e.g. "import_routes_auth")."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _phases[name] = time.perf_counter() - start
+
+
+def _format(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
+def mark_ready() -> str:
+    """Record that startup finished and return the one-line report to log."""
+    global _ready_at
+    with _lock:
+        _ready_at = time.perf_counter()
+        parts = [f"{name} {_format(seconds)}" for name, seconds in _phases.items()]
+    return f"⏱️ Startup took {_format(_ready_at - _started)} ({', '.join(parts)})"
+
+
+def get_startup_stats() -> dict:
+    """Phase durations in seconds, plus the total time to ready."""
+    with _lock:
+        stats = {f"{name}_seconds": round(seconds, 6) for name, seconds in _phases.items()}
+        if _ready_at is not None:
+            stats["ready_seconds"] = round(_ready_at - _started, 6)
+        return stats
+
+
+class FirstRequestTimer:
+    """Pure ASGI middleware that times and logs the first HTTP request, then steps aside."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        if self.done or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.done = True
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                _phases["first_request"] = elapsed
+            logger.info(
+                f"⏱️ First request {scope['method']} {scope['path']} took {_format(elapsed)} "
+                f"({_format(start - _started)} after startup began)"
+            )
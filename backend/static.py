@@ -0,0 +1,185 @@
+# ─────────────────────────────────────────────
+# 🖥️ static.py — Frontend Serving with Precompressed Assets
+# ─────────────────────────────────────────────
+#
+# The frontend is mounted by main.py under FRONTEND_PATH ("/" redirects
+# there); not at "/" itself, where the mount would also catch the API's
+# slashless paths (/services, /admin...) before the router can redirect
+# them to their trailing-slash routes. Text assets are compressed
+# once, ahead of time (at startup, or at build time with
+# `python backend/static.py`), into `.br` / `.gz` files next to the
+# originals; each request then picks the best variant the client accepts,
+# with no compression work on the request path.
+#
+# Cache headers: fingerprinted files (e.g. app.3f9a1c2b.js) never change
+# and are cached for a year as immutable; HTML is always revalidated with
+# its ETag (a 304 when unchanged); anything else is cached for an hour.
+
+import gzip
+import mimetypes
+import os
+import re
+import sys
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from logger import logger
+
+try:  # optional: without it only gzip variants are produced
+    import brotli
+except ImportError:
+    brotli = None
+
+# ─────────────────────────────────────────────
+# 🌍 Load configuration from environment
+# ─────────────────────────────────────────────
+FRONTEND_DIR = os.getenv("FRONTEND_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "frontend"
+)
+FRONTEND_PATH = "/app"
+STATIC_PRECOMPRESS = os.getenv("STATIC_PRECOMPRESS", "true").lower() in ("1", "true", "yes")
+
+# Files worth compressing (images, fonts... are already compressed)
+COMPRESSIBLE_SUFFIXES = (".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest")
+
+# Content-Encoding → file suffix, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HTML_CACHE_CONTROL = "no-cache"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+# A content hash in the file name, e.g. "app.3f9a1c2b.js" or "chunk-5e1d0a9f.css"
+_FINGERPRINT = re.compile(r"[.-][0-9a-f]{8,}\.[a-z0-9]+$", re.IGNORECASE)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)  # mtime=0: identical bytes on every build
+
+
+def _available_encodings() -> tuple[tuple[str, str], ...]:
+    return tuple((encoding, suffix) for encoding, suffix in ENCODINGS if encoding != "br" or brotli)
+
+
+def precompress(directory: str) -> int:
+    """
+    Write `.br` / `.gz` variants of every compressible file under `directory`.
+
+    Up-to-date variants are skipped, so this is cheap after the first run.
+    Variants are written to a temp file and renamed, so workers starting
+    together never serve a partial file. A variant that would not be
+    smaller than the original is not written.
+
+    Args:
+        directory (str): Root of the static files.
+
+    Returns:
+        int: Number of variant files written.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            source_mtime = os.stat(path).st_mtime
+            data = None
+            for encoding, suffix in _available_encodings():
+                variant = path + suffix
+                if os.path.exists(variant) and os.stat(variant).st_mtime >= source_mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                compressed = _compress(data, encoding)
+                if len(compressed) >= len(data):
+                    continue
+                tmp_path = f"{variant}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, variant)
+                written += 1
+    return written
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Encodings listed in Accept-Encoding, minus those refused with q=0."""
+    accepted = set()
+    for item in header.split(","):
+        name, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip() and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def cache_control(path: str) -> str:
+    """Cache-Control for a static file, from its name."""
+    if path.endswith(".html"):
+        return HTML_CACHE_CONTROL
+    if _FINGERPRINT.search(os.path.basename(path)):
+        return IMMUTABLE_CACHE_CONTROL
+    return DEFAULT_CACHE_CONTROL
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves the precompressed variant the client accepts."""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted and "*" not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if variant_stat.st_mtime < stat_result.st_mtime:
+                continue  # stale: the original changed since it was compressed
+            media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            # Each variant has its own size and mtime, hence its own ETag
+            response = FileResponse(full_path + suffix, status_code=status_code, stat_result=variant_stat, media_type=media_type)
+            response.headers["content-encoding"] = encoding
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        response.headers["vary"] = "Accept-Encoding"
+        response.headers["cache-control"] = cache_control(full_path)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress_frontend() -> None:
+    """Precompress FRONTEND_DIR at startup; failures only cost bandwidth."""
+    if not (STATIC_PRECOMPRESS and os.path.isdir(FRONTEND_DIR)):
+        return
+    try:
+        written = precompress(FRONTEND_DIR)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not precompress {FRONTEND_DIR}, serving uncompressed files: {e}")
+        return
+    if written:
+        logger.info(f"🗜️ Precompressed {written} frontend files ({', '.join(e for e, _ in _available_encodings())})")
+
+
+if __name__ == "__main__":
+    # Build step: python backend/static.py [directory]
+    directory = sys.argv[1] if len(sys.argv) > 1 else FRONTEND_DIR
+    print(f"🗜️ {precompress(directory)} variant files written under {directory}")
@@ -0,0 +1,239 @@
+# ─────────────────────────────────────────────
+# ⏱️ benchmarks/run.py — In-Process API Load Test
+# ─────────────────────────────────────────────
+#
+# Seeds a fresh SQLite database, then drives the FastAPI app in-process
+# through httpx's ASGI transport (no network, no uvicorn) with a locally
+# signed admin JWT. Each scenario runs a fixed number of requests at a fixed
+# concurrency and reports p50/p95/p99 latency and requests per second.
+# Results are written as JSON; pass --compare to diff against an older run.
+#
+# Usage (from the repository root):
+#   python benchmarks/run.py --bookings 50000 --requests 500 --output after.json --compare before.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BENCH_DIR, "..", "backend")
+
+ADMIN_EMAIL = "bench-admin@example.com"
+SECRET_KEY = "benchmark-secret"
+
+
+def configure_environment(db_path: str, rate_limit: bool = False) -> None:
+    """
+    Point the backend at the benchmark database before it is imported.
+
+    With `rate_limit`, admission control stays on (concurrency limiter and
+    per-email buckets); only the per-IP bucket is lifted, since one client
+    IP sends every request.
+    """
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["ADMIN_EMAIL"] = ADMIN_EMAIL
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+    os.environ.setdefault("GOOGLE_CLIENT_SECRET", "benchmark")
+    os.environ.setdefault("LOG_LEVEL", "CRITICAL")  # keep log I/O out of the numbers
+    if rate_limit:
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "true")
+        os.environ.setdefault("BOOKING_RATE_PER_IP", "1000000")
+        os.environ.setdefault("BOOKING_BURST_PER_IP", "1000000")
+    else:
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # one client IP sends every request
+    os.environ.setdefault("OAUTH_WARMUP", "false")  # no discovery fetch with fake credentials
+    os.environ.setdefault("LOG_FILE", os.path.join(os.path.dirname(db_path), "bench.log"))
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def admin_token() -> str:
+    """Sign an admin JWT the same way /auth/callback does."""
+    from jose import jwt
+    payload = {
+        "sub": ADMIN_EMAIL,
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        "iss": "multi-service-backend",
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+# ─────────────────────────────────────────────
+# 🎬 Scenarios — each builds the i-th request as (method, url, json body)
+# ─────────────────────────────────────────────
+# Mostly selective lookups (email local parts), plus a few broad words from seed.py
+SEARCH_TERMS = ["martin42", "alice dubois17", "chloe.robert3", "hugo pet", "felix", "gate"]
+
+
+def build_scenarios(services: int, bookings: int) -> dict:
+    future = datetime(2035, 1, 1, tzinfo=timezone.utc)
+    # Updates reschedule into their own range: concurrent creates get their
+    # IDs out of order, so reusing a create's slot could hit another booking
+    rescheduled = datetime(2045, 1, 1, tzinfo=timezone.utc)
+
+    def booking_body(i: int, start: datetime = future) -> dict:
+        return {
+            "name": f"Bench Client {i}",
+            "email": f"bench{i}@example.com",
+            "service_id": 1 + i % services,
+            # A distinct slot per request so conflict checks never reject it
+            "appointment_time": (start + timedelta(hours=3 * i)).isoformat(),
+        }
+
+    def service_body(i: int) -> dict:
+        return {"name": f"Bench Service {i}", "description": "Benchmark", "price": 50.0 + i % 10, "duration_min": 60}
+
+    return {
+        "services.list":   lambda i: ("GET", "/services/", None),
+        "services.get":    lambda i: ("GET", f"/services/{1 + i % services}", None),
+        "services.create": lambda i: ("POST", "/services/", service_body(i)),
+        "services.update": lambda i: ("PUT", f"/services/{services + 1 + i}", service_body(i)),
+        "services.delete": lambda i: ("DELETE", f"/services/{services + 1 + i}", None),
+        "bookings.list":   lambda i: ("GET", "/bookings/?limit=50", None),
+        "bookings.get":    lambda i: ("GET", f"/bookings/{1 + (i * 7919) % bookings}", None),
+        "bookings.search": lambda i: ("GET", f"/bookings/search?q={SEARCH_TERMS[i % len(SEARCH_TERMS)]}", None),
+        "bookings.create": lambda i: ("POST", "/bookings/", booking_body(i)),
+        "bookings.update": lambda i: ("PUT", f"/bookings/{bookings + 1 + i}", booking_body(i, rescheduled)),
+        "bookings.delete": lambda i: ("DELETE", f"/bookings/{bookings + 1 + i}", None),
+    }
+
+
+async def run_scenario(client, build, requests: int, concurrency: int) -> dict:
+    """Fire `requests` requests with at most `concurrency` in flight."""
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        method, url, body = build(i)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run_all(args) -> dict:
+    import httpx
+    from main import app
+
+    scenarios = build_scenarios(args.services, args.bookings)
+    selected = [name for name in scenarios if not args.only or any(name.startswith(p) for p in args.only)]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        client.cookies.set("access_token", admin_token())
+        # Warm up caches and connection pools
+        for name in selected:
+            if name.endswith((".list", ".get", ".search")):
+                for i in range(min(20, args.requests)):
+                    method, url, body = scenarios[name](i)
+                    await client.request(method, url, json=body)
+
+        results = {}
+        for name in selected:
+            results[name] = await run_scenario(client, scenarios[name], args.requests, args.concurrency)
+            print(f"  {name:<16} {results[name]['rps']:>9} req/s   p50 {results[name]['p50_ms']:>8} ms   "
+                  f"p95 {results[name]['p95_ms']:>8} ms   p99 {results[name]['p99_ms']:>8} ms   "
+                  f"errors {results[name]['errors']}")
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(current: dict, baseline_path: str) -> None:
+    """Print the change of rps and p95 per scenario against an older result file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\n📊 Compared with {baseline_path}")
+    for name, result in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        rps_delta = (result["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        p95_delta = (result["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        print(f"  {name:<16} rps {rps_delta:+7.1f}%   p95 {p95_delta:+7.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Multi-Services API in-process")
+    parser.add_argument("--services", type=int, default=20, help="Services to seed")
+    parser.add_argument("--bookings", type=int, default=10000, help="Bookings to seed")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep admission control on (per-IP limit lifted)")
+    parser.add_argument("--only", nargs="*", help="Run only scenarios starting with these prefixes")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Older result file to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    configure_environment(os.path.join(workdir, "bench.db"), args.rate_limit)
+
+    from seed import seed_database
+    print(f"🌱 Seeding {args.services} services / {args.bookings} bookings in {workdir}")
+    seed_database(args.services, args.bookings, args.seed)
+
+    print(f"⏱️ {args.requests} requests per scenario, concurrency {args.concurrency}")
+    results = asyncio.run(run_all(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# ─────────────────────────────────────────────
+# 🌱 benchmarks/seed.py — Synthetic Data Generator
+# ─────────────────────────────────────────────
+#
+# Fills a database with N services and M bookings. The data is derived from
+# a fixed random seed so two runs against the same parameters benchmark the
+# exact same dataset.
+#
+# Usage (from the repository root):
+#   python benchmarks/seed.py --db bench.db --services 20 --bookings 100000
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+FIRST_NAMES = ["Alice", "Bob", "Chloe", "David", "Emma", "Felix", "Grace", "Hugo", "Iris", "Jules"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand"]
+SERVICE_NAMES = ["TV Mounting", "Furniture Assembly", "Plumbing Repair", "Painting", "Gutter Cleaning",
+                 "Lawn Mowing", "Drywall Repair", "Light Fixture Install", "Door Repair", "Shelf Install"]
+STATUSES = ["pending", "confirmed", "done", "cancelled"]
+
+# Synthetic bookings are spread over this window, on a 30-minute grid
+START_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SPAN_DAYS = 3 * 365
+
+
+def generate_services(count: int, rng: random.Random) -> list[dict]:
+    """Build `count` service rows."""
+    return [
+        {
+            "name": f"{SERVICE_NAMES[i % len(SERVICE_NAMES)]} #{i + 1}",
+            "description": "Synthetic benchmark service",
+            "price": round(rng.uniform(30, 300), 2),
+            "duration_min": rng.choice([30, 60, 90, 120]),
+            "active": True,
+        }
+        for i in range(count)
+    ]
+
+
+def generate_bookings(count: int, service_ids: list[int], rng: random.Random):
+    """Yield `count` booking rows spread over services, statuses and three years."""
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        slot = rng.randrange(SPAN_DAYS * 48)
+        yield {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{i % 5000}@example.com",
+            "phone": f"+1555{rng.randrange(10**6, 10**7)}",
+            "service_id": rng.choice(service_ids),
+            "message": rng.choice([None, "Please call before coming", "Gate code 1234"]),
+            "appointment_time": START_DATE + timedelta(minutes=30 * slot),
+            "status": rng.choice(STATUSES),
+            "created_at": now,
+        }
+
+
+def seed_database(services: int, bookings: int, seed: int = 42, chunk_size: int = 5000) -> None:
+    """
+    Create the schema and insert synthetic rows through the app's own engine.
+
+    DATABASE_URL must be set before calling (the backend reads it at import).
+    """
+    sys.path.insert(0, BACKEND_DIR)
+    from sqlalchemy import insert
+    from database import engine, init_db
+    from models import Booking, Service
+
+    rng = random.Random(seed)
+    init_db()
+
+    with engine.begin() as conn:
+        result = conn.execute(
+            insert(Service).returning(Service.id, sort_by_parameter_order=True),
+            generate_services(services, rng),
+        )
+        service_ids = list(result.scalars())
+
+    chunk = []
+    for row in generate_bookings(bookings, service_ids, rng):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            with engine.begin() as conn:
+                conn.execute(insert(Booking), chunk)
+            chunk = []
+    if chunk:
+        with engine.begin() as conn:
+            conn.execute(insert(Booking), chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a database with synthetic services and bookings")
+    parser.add_argument("--db", default="bench.db", help="SQLite file to create (ignored if DATABASE_URL is set)")
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.abspath(args.db)}")
+    seed_database(args.services, args.bookings, args.seed)
+    print(f"🌱 Seeded {args.services} services and {args.bookings} bookings into {os.environ['DATABASE_URL']}")
+
+
+if __name__ == "__main__":
+    main()
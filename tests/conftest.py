@@ -0,0 +1,44 @@
+# ─────────────────────────────────────────────
+# 🧪 tests/conftest.py — App Client on a Throwaway Database
+# ─────────────────────────────────────────────
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+
+@pytest.fixture(scope="session")
+def client():
+    workdir = tempfile.mkdtemp(prefix="backend-tests-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'test.db')}"
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("ADMIN_EMAIL", "admin@example.com")
+    os.environ.setdefault("OAUTH_WARMUP", "false")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("LOG_FILE", os.path.join(workdir, "test.log"))
+    sys.path.insert(0, BACKEND_DIR)
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app, follow_redirects=False) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    """Cookie header with an admin JWT, signed the same way /auth/callback does."""
+    from datetime import datetime, timedelta, timezone
+    from jose import jwt
+
+    payload = {
+        "sub": os.environ["ADMIN_EMAIL"],
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        "iss": "multi-service-backend",
+    }
+    token = jwt.encode(payload, os.environ["SECRET_KEY"], algorithm="HS256")
+    return {"Cookie": f"access_token={token}"}
@@ -0,0 +1,56 @@
+# ─────────────────────────────────────────────
+# 🧪 tests/test_bookings_list.py — GET /bookings Filters and Cursors
+# ─────────────────────────────────────────────
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def bookings(client, admin_headers):
+    service = client.post("/services/", json={
+        "name": "List test", "description": "d", "price": 10.0, "duration_min": 60,
+    }, headers=admin_headers).json()
+    ids = []
+    for day in (1, 2, 3):
+        response = client.post("/bookings/", json={
+            "name": "Client", "email": f"list{day}@example.com",
+            "service_id": service["id"], "appointment_time": f"2040-01-0{day}T10:00:00Z",
+        })
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.parametrize("query", [
+    "from=2040-01-02T00:00:00",     # naive: taken as UTC
+    "from=2040-01-02T00:00:00Z",
+    "from=2040-01-02T01:00:00%2B01:00",
+])
+def test_date_filters_accept_naive_and_aware_values(client, admin_headers, bookings, query):
+    response = client.get(f"/bookings/?{query}&to=2040-01-04T00:00:00", headers=admin_headers)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == bookings[1:]
+
+
+def test_export_accepts_naive_date_filter(client, admin_headers, bookings):
+    response = client.get("/bookings/export?from=2040-01-03T00:00:00", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 1
+
+
+def test_cursor_walks_every_page(client, admin_headers, bookings):
+    seen, cursor = [], None
+    while True:
+        url = "/bookings/?limit=1&from=2040-01-01T00:00:00" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=admin_headers).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == bookings
+
+
+def test_bad_cursor_is_a_400(client, admin_headers):
+    response = client.get("/bookings/?cursor=not-a-cursor", headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,33 @@
+# ─────────────────────────────────────────────
+# 🧪 tests/test_frontend_mount.py — API Reachable Next to the Frontend Mount
+# ─────────────────────────────────────────────
+
+import pytest
+
+
+@pytest.mark.parametrize("method, path", [
+    ("GET", "/services"),
+    ("GET", "/bookings"),
+    ("GET", "/admin"),
+    ("POST", "/bookings"),
+])
+def test_slashless_api_paths_redirect(client, method, path):
+    response = client.request(method, path)
+    assert response.status_code == 307
+    assert response.headers["location"].endswith(path + "/")
+
+
+def test_api_routes_answer(client):
+    assert client.get("/services/").status_code == 200
+    assert client.get("/admin/").status_code == 401
+
+
+def test_frontend_is_served(client):
+    response = client.get("/")
+    assert response.status_code == 307
+    assert response.headers["location"] == "/app/"
+
+    response = client.get("/app/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,20 @@
+# ─────────────────────────────────────────────
+# 🧪 tests/test_services_update.py — PUT /services/{id} Writes Every Field
+# ─────────────────────────────────────────────
+
+
+def test_put_writes_duration_and_active(client, admin_headers):
+    service = client.post("/services/", json={
+        "name": "Put test", "description": "d", "price": 10.0, "duration_min": 30,
+    }, headers=admin_headers).json()
+
+    response = client.put(f"/services/{service['id']}", json={
+        "name": "Put test 2", "description": "d2", "price": 12.0, "duration_min": 90, "active": False,
+    }, headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["name"], body["price"], body["duration_min"], body["active"]) == ("Put test 2", 12.0, 90, False)
+
+    catalog = client.get("/services/?include_inactive=true", headers=admin_headers).json()
+    stored = next(item for item in catalog if item["id"] == service["id"])
+    assert (stored["duration_min"], stored["active"]) == (90, False)